@@ -11,23 +11,28 @@ from .registry import TRANSFORM_DICT
 EDGE_SIZE = 4
 Y_K_SIZE = 6
 X_K_SIZE = 6
+EDGE_KERNEL = np.ones((EDGE_SIZE, EDGE_SIZE), np.uint8)
 
 
-def reduce_label(label: np.ndarray) -> Image.Image:
-    label[label == 0] = 255
-    label = label - 1
-    label[label == 254] = 255
-    return Image.fromarray(label)
+def reduce_label(label: np.ndarray) -> np.ndarray:
+    label = np.asarray(label, dtype=np.uint8)
+    # uint8 subtraction wraps 0 to 255, so only the existing ignore index needs to be restored
+    reduced = np.subtract(label, 1, dtype=np.uint8)
+    reduced[label == 255] = 255
+    return reduced
 
 
 def generate_edge(label: np.ndarray) -> Image.Image:
     edge = cv2.Canny(label, 0.1, 0.2)
-    kernel = np.ones((EDGE_SIZE, EDGE_SIZE), np.uint8)
     # edge_pad == True
-    edge = edge[Y_K_SIZE:-Y_K_SIZE, X_K_SIZE:-X_K_SIZE]
-    edge = np.pad(edge, ((Y_K_SIZE, Y_K_SIZE), (X_K_SIZE, X_K_SIZE)), mode='constant')
-    edge = (cv2.dilate(edge, kernel, iterations=1) > 50) * 1.0
-    return Image.fromarray((edge.copy() * 255).astype(np.uint8))
+    # Zero the borders in place instead of cropping and padding back to the original size
+    edge[:Y_K_SIZE, :] = 0
+    edge[-Y_K_SIZE:, :] = 0
+    edge[:, :X_K_SIZE] = 0
+    edge[:, -X_K_SIZE:] = 0
+    edge = cv2.dilate(edge, EDGE_KERNEL, iterations=1)
+    _, edge = cv2.threshold(edge, 50, 255, cv2.THRESH_BINARY)
+    return Image.fromarray(edge)
 
 
 def transforms_check(transforms):
@@ -40,7 +45,7 @@ def transforms_check(transforms):
     return transforms
 
 
-def transforms_custom(conf_augmentation, training):
+def build_preprocess(conf_augmentation, training):
     phase_conf = conf_augmentation.train if training else conf_augmentation.inference
 
     preprocess = []
@@ -58,28 +63,15 @@ def transforms_custom(conf_augmentation, training):
         TC.ToTensor(),
         TC.Normalize(mean=IMAGENET_DEFAULT_MEAN, std=IMAGENET_DEFAULT_STD)
     ]
-    return TC.Compose(preprocess)
+    return preprocess
 
 
-def train_transforms_pidnet(conf_augmentation, training):
-    preprocess = []
-    phase_conf = conf_augmentation.train if training else conf_augmentation.inference
+def transforms_custom(conf_augmentation, training):
+    return TC.Compose(build_preprocess(conf_augmentation, training))
 
-    if phase_conf:
-        checked_transforms = transforms_check(phase_conf)
-        for augment in checked_transforms:
-            name = augment.name.lower()
-            augment_kwargs = list(augment.keys())
-            augment_kwargs.remove('name')
-            augment_kwargs = {k:augment[k] for k in augment_kwargs}
-            transform = TRANSFORM_DICT[name](**augment_kwargs)
-            preprocess.append(transform)
 
-    preprocess = preprocess + [
-        TC.ToTensor(),
-        TC.Normalize(mean=IMAGENET_DEFAULT_MEAN, std=IMAGENET_DEFAULT_STD)
-    ]
-    return TC.Compose(preprocess, additional_targets={'edge': 'mask'})
+def train_transforms_pidnet(conf_augmentation, training):
+    return TC.Compose(build_preprocess(conf_augmentation, training), additional_targets={'edge': 'mask'})
 
 
 def create_transform(model_name: str, is_training=False):
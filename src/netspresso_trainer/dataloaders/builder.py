@@ -3,6 +3,7 @@ from functools import partial
 from pathlib import Path
 from typing import Dict, List, Literal, Optional, Type, Union
 
+import torch
 import torch.distributed as dist
 import torch.utils.data as data
 from loguru import logger
@@ -163,6 +164,14 @@ def build_dataloader(conf, task: str, model_name: str, dataset, phase, profile=F
     #TODO: Temporarily set ``cache_data`` as optional since this is experimental
     cache_data = conf.environment.cache_data if hasattr(conf.environment, 'cache_data') else False
 
+    # Batches prepared ahead by each worker, so augmentation overlaps with the forward/backward of the current batch
+    prefetch_factor = conf.environment.prefetch_factor if hasattr(conf.environment, 'prefetch_factor') else 2
+    if is_training and conf.environment.num_workers == 0 and not profile:
+        logger.warning("environment.num_workers is 0. Data loading runs in the main process and may bottleneck training.")
+
+    # Page-locked batches let task processors copy them to GPU with ``non_blocking=True``
+    pin_memory = torch.cuda.is_available()
+
     if task == 'classification':
         # TODO: ``phase`` should be removed later.
         transforms = getattr(conf.augmentation, phase, None)
@@ -190,10 +199,11 @@ def build_dataloader(conf, task: str, model_name: str, dataset, phase, profile=F
             num_workers=conf.environment.num_workers if not profile else 1,
             distributed=conf.distributed,
             collate_fn=collate_fn,
-            pin_memory=False,
+            pin_memory=pin_memory,
             world_size=conf.world_size,
             rank=conf.rank,
             cache_data=cache_data,
+            prefetch_factor=prefetch_factor,
             kwargs=None
         )
     elif task == 'segmentation':
@@ -213,10 +223,11 @@ def build_dataloader(conf, task: str, model_name: str, dataset, phase, profile=F
             num_workers=conf.environment.num_workers if not profile else 1,
             distributed=conf.distributed,
             collate_fn=collate_fn,
-            pin_memory=False,
+            pin_memory=pin_memory,
             world_size=conf.world_size,
             rank=conf.rank,
             cache_data=cache_data,
+            prefetch_factor=prefetch_factor,
             kwargs=None
         )
     elif task == 'detection':
@@ -236,10 +247,11 @@ def build_dataloader(conf, task: str, model_name: str, dataset, phase, profile=F
             num_workers=conf.environment.num_workers if not profile else 1,
             distributed=conf.distributed,
             collate_fn=collate_fn,
-            pin_memory=False,
+            pin_memory=pin_memory,
             world_size=conf.world_size,
             rank=conf.rank,
             cache_data=cache_data,
+            prefetch_factor=prefetch_factor,
             kwargs=None
         )
     elif task == 'pose_estimation':
@@ -254,10 +266,11 @@ def build_dataloader(conf, task: str, model_name: str, dataset, phase, profile=F
             num_workers=conf.environment.num_workers if not profile else 1,
             distributed=conf.distributed,
             collate_fn=collate_fn,
-            pin_memory=False,
+            pin_memory=pin_memory,
             world_size=conf.world_size,
             rank=conf.rank,
             cache_data=cache_data,
+            prefetch_factor=prefetch_factor,
             kwargs=None
         )
     else:
@@ -41,8 +41,8 @@ class DetectionSampleLoader(BaseSampleLoader):
                     labels.append(str(ann_path_maybe))
                 # TODO: get paired data from regex pattern matching (self.conf_data.path.pattern)
 
-            images = sorted(images, key=lambda k: natural_key(k))
-            labels = sorted(labels, key=lambda k: natural_key(k))
+            images = sorted(images, key=natural_key)
+            labels = sorted(labels, key=natural_key)
             images_and_targets.extend([{'image': str(image), 'label': str(label)} for image, label in zip(images, labels)])
 
         else:
@@ -163,12 +163,11 @@ class DetectionCustomDataset(BaseCustomDataset):
         ann_path = Path(self.samples[index]['label']) if 'label' in self.samples[index] else None
         img = Image.open(str(img_path)).convert('RGB')
 
-        org_img = img.copy()
         w, h = img.size
         if ann_path is None:
-            return org_img, np.zeros(0, 1), np.zeros(0, 5)
+            return img, np.zeros(0, 1), np.zeros(0, 5)
 
         label, boxes_yolo = get_detection_label(Path(ann_path))
         boxes = self.xywhn2xyxy(boxes_yolo, w, h)
 
-        return org_img, label, boxes
+        return img, label, boxes
@@ -39,8 +39,8 @@ class PoseEstimationSampleLoader(BaseSampleLoader):
                     labels.append(str(ann_path_maybe))
                 # TODO: get paired data from regex pattern matching (self.conf_data.path.pattern)
 
-            images = sorted(images, key=lambda k: natural_key(k))
-            labels = sorted(labels, key=lambda k: natural_key(k))
+            images = sorted(images, key=natural_key)
+            labels = sorted(labels, key=natural_key)
             images_and_targets.extend([{'image': str(image), 'label': str(label)} for image, label in zip(images, labels)])
 
         else:
@@ -1,10 +1,10 @@
 import json
 import os
+from dataclasses import dataclass
 from functools import partial
-from itertools import chain
 from multiprocessing.pool import ThreadPool
 from pathlib import Path
-from typing import Dict, List, Literal, Optional, Tuple, Union
+from typing import Dict, Literal, Optional, Tuple, Union
 
 import numpy as np
 import PIL.Image as Image
@@ -15,8 +15,20 @@ from omegaconf import DictConfig, ListConfig
 
 from .augmentation.transforms import generate_edge
 from .base import BaseCustomDataset, BaseHFDataset, BaseSampleLoader
-from .utils.constants import IMG_EXTENSIONS
-from .utils.misc import as_tuple, natural_key
+from .utils.misc import as_tuple, list_image_files, natural_key
+
+
+@dataclass(frozen=True)
+class SegmentationSamples:
+    """Image and label paths of a split, kept as two parallel tuples instead of a dict per sample."""
+    images: Tuple[str, ...]
+    labels: Tuple[Optional[str], ...]
+
+    def __len__(self):
+        return len(self.images)
+
+    def __getitem__(self, index):
+        return self.images[index], self.labels[index]
 
 
 class SegmentationSampleLoader(BaseSampleLoader):
@@ -29,26 +41,22 @@ class SegmentationSampleLoader(BaseSampleLoader):
         split_dir = self.conf_data.path[split]
         image_dir: Path = data_root / split_dir.image
         annotation_dir: Optional[Path] = data_root / split_dir.label if split_dir.label is not None else None
-        images: List[str] = []
-        labels: List[str] = []
-        images_and_targets: List[Dict[str, str]] = []
         if annotation_dir is not None:
-            for ext in IMG_EXTENSIONS:
-                images.extend([str(file) for file in chain(image_dir.glob(f'*{ext}'), image_dir.glob(f'*{ext.upper()}'))])
-                # TODO: get paired data from regex pattern matching (conf_data.path.pattern)
-                labels.extend([str(file) for file in chain(annotation_dir.glob(f'*{ext}'), annotation_dir.glob(f'*{ext.upper()}'))])
+            images = list_image_files(image_dir)
+            # TODO: get paired data from regex pattern matching (conf_data.path.pattern)
+            labels = list_image_files(annotation_dir)
 
-            images = sorted(images, key=lambda k: natural_key(k))
-            labels = sorted(labels, key=lambda k: natural_key(k))
-            images_and_targets.extend([{'image': str(image), 'label': str(label)} for image, label in zip(images, labels)])
+            images = sorted(images, key=natural_key)
+            labels = sorted(labels, key=natural_key)
+            num_pairs = min(len(images), len(labels))
+            images, labels = images[:num_pairs], labels[:num_pairs]
 
         else:
-            for ext in IMG_EXTENSIONS:
-                images_and_targets.extend([{'image': str(file), 'label': None}
-                                           for file in chain(image_dir.glob(f'*{ext}'), image_dir.glob(f'*{ext.upper()}'))])
-            images_and_targets = sorted(images_and_targets, key=lambda k: natural_key(k['image']))
+            images = list_image_files(image_dir)
+            images = sorted(images, key=natural_key)
+            labels = [None] * len(images)
 
-        return images_and_targets
+        return SegmentationSamples(images=tuple(images), labels=tuple(labels))
 
     def load_id_mapping(self):
         root_path = Path(self.conf_data.path.root)
@@ -133,19 +141,27 @@ class SegmentationCustomDataset(BaseCustomDataset):
         )
         assert "label_value_to_idx" in kwargs
         self.label_value_to_idx = kwargs["label_value_to_idx"]
+        # Label values are converted once here to avoid rebuilding them for every sample
+        self.label_values = [(np.array(label_value), class_idx) for label_value, class_idx in self.label_value_to_idx.items()]
 
         self.label_image_mode: Literal['RGB', 'L', 'P'] = str(conf_data.label_image_mode).upper() \
             if conf_data.label_image_mode is not None else 'L'
 
+        self._is_pidnet = 'pidnet' in self.model_name
+        self._is_train = self._split in ['train', 'training']
+        assert self._is_train or self._split in ['val', 'valid', 'test']
+
+        # Loaded images and labels are kept apart from ``self.samples``, which only holds paths
+        self.cached_samples: Dict[int, Tuple[Image.Image, Optional[Image.Image]]] = {}
+
     def cache_dataset(self, sampler, distributed):
         if (not distributed) or (distributed and dist.get_rank() == 0):
             logger.info(f'Caching | Loading samples of {self.mode} to memory... This can take minutes.')
 
         def _load(i, samples):
-            image = Image.open(Path(samples[i]['image'])).convert('RGB')
-            label = self.samples[i]['label']
-            if label is not None:
-                label = Image.open(Path(label)).convert(self.label_image_mode)
+            img_path, ann_path = samples[i]
+            image = Image.open(Path(img_path)).convert('RGB')
+            label = Image.open(Path(ann_path)).convert(self.label_image_mode) if ann_path is not None else None
             return i, image, label
 
         num_threads = 8 # TODO: Compute appropriate num_threads
@@ -154,18 +170,15 @@ class SegmentationCustomDataset(BaseCustomDataset):
             sampler
         )
         for i, image, label in load_imgs:
-            self.samples[i]['image'] = image
-            self.samples[i]['label'] = label
+            self.cached_samples[i] = (image, label)
 
         self.cache = True
 
     def __getitem__(self, index):
         if self.cache:
-            img = self.samples[index]['image']
-            label = self.samples[index]['label']
+            img, label = self.cached_samples[index]
         else:
-            img_path = self.samples[index]['image']
-            ann_path = self.samples[index]['label']
+            img_path, ann_path = self.samples[index]
             img = Image.open(Path(img_path)).convert('RGB')
             label = Image.open(Path(ann_path)).convert(self.label_image_mode) if ann_path is not None else None
 
@@ -179,30 +192,29 @@ class SegmentationCustomDataset(BaseCustomDataset):
             return outputs
 
 
-        label_array = np.array(label)
+        label_array = np.asarray(label)
         label_array = label_array[..., np.newaxis] if label_array.ndim == 2 else label_array
         # if self.conf_augmentation.reduce_zero_label:
-        #     label = reduce_label(np.array(label))
+        #     label = reduce_label(np.asarray(label))
 
-        mask = np.zeros((label.size[1], label.size[0]), dtype=np.uint8)
-        for label_value in self.label_value_to_idx:
-            class_mask = (label_array == np.array(label_value)).all(axis=-1)
-            mask[class_mask] = self.label_value_to_idx[label_value]
+        mask_array = np.zeros((label.size[1], label.size[0]), dtype=np.uint8)
+        for label_value, class_idx in self.label_values:
+            class_mask = (label_array == label_value).all(axis=-1)
+            mask_array[class_mask] = class_idx
 
-        mask = Image.fromarray(mask, mode='L')  # single mode array (PIL.Image) compatbile with torchvision transform API
+        mask = Image.fromarray(mask_array, mode='L')  # single mode array (PIL.Image) compatbile with torchvision transform API
 
-        if 'pidnet' in self.model_name:
-            edge = generate_edge(np.array(mask))
+        if self._is_pidnet:
+            edge = generate_edge(mask_array)
             out = self.transform(image=img, mask=mask, edge=edge)
             outputs.update({'pixel_values': out['image'], 'labels': out['mask'], 'edges': out['edge'].float()})
         else:
             out = self.transform(image=img, mask=mask)
             outputs.update({'pixel_values': out['image'], 'labels': out['mask']})
 
-        if self._split in ['train', 'training']:
+        if self._is_train:
             return outputs
 
-        assert self._split in ['val', 'valid', 'test']
         # outputs.update({'org_img': org_img, 'org_shape': (h, w)})  # TODO: return org_img with batch_size > 1
         outputs.update({'org_shape': (h, w)})
         return outputs
@@ -236,12 +248,19 @@ class SegmentationHFDataset(BaseHFDataset):
 
         assert "label_value_to_idx" in kwargs
         self.label_value_to_idx = kwargs["label_value_to_idx"]
+        # Label values are converted once here to avoid rebuilding them for every sample
+        self.label_values = [(np.array(label_value), class_idx) for label_value, class_idx in self.label_value_to_idx.items()]
 
         self.label_image_mode: Literal['RGB', 'L', 'P'] = str(conf_data.label_image_mode).upper() \
             if conf_data.label_image_mode is not None else 'L'
 
         self.image_feature_name = conf_data.metadata.features.image
         self.label_feature_name = conf_data.metadata.features.label
+        self._has_label = self.label_feature_name in huggingface_dataset.column_names
+
+        self._is_pidnet = self.model_name == 'pidnet'
+        self._is_train = self._split in ['train', 'training']
+        assert self._is_train or self._split in ['val', 'valid', 'test']
 
     @property
     def num_classes(self):
@@ -257,19 +276,9 @@ class SegmentationHFDataset(BaseHFDataset):
     def __getitem__(self, index):
 
         img_name = f"{index:06d}"
-        img: Image.Image = self.samples[index][self.image_feature_name]
-        label: Image.Image = self.samples[index][self.label_feature_name] if self.label_feature_name in self.samples[index] else None
-
-        label_array = np.array(label.convert(self.label_image_mode))
-        label_array = label_array[..., np.newaxis] if label_array.ndim == 2 else label_array
-        # if self.conf_augmentation.reduce_zero_label:
-        #     label = reduce_label(np.array(label))
-
-        mask = np.zeros((label.size[1], label.size[0]), dtype=np.uint8)
-        for label_value in self.label_value_to_idx:
-            class_mask = (label_array == np.array(label_value)).all(axis=-1)
-            mask[class_mask] = self.label_value_to_idx[label_value]
-        mask = Image.fromarray(mask, mode='L')  # single mode array (PIL.Image) compatbile with torchvision transform API
+        row = self.samples[index]  # Decode the row only once
+        img: Image.Image = row[self.image_feature_name]
+        label: Optional[Image.Image] = row[self.label_feature_name] if self._has_label else None
 
         w, h = img.size
 
@@ -277,10 +286,23 @@ class SegmentationHFDataset(BaseHFDataset):
             out = self.transform(image=img)
             return {'pixel_values': out['image'], 'name': img_name, 'org_shape': (h, w)}
 
+        if label.mode != self.label_image_mode:  # ``convert`` copies the image even if the mode already matches
+            label = label.convert(self.label_image_mode)
+        label_array = np.asarray(label)
+        label_array = label_array[..., np.newaxis] if label_array.ndim == 2 else label_array
+        # if self.conf_augmentation.reduce_zero_label:
+        #     label = reduce_label(np.asarray(label))
+
+        mask_array = np.zeros((label.size[1], label.size[0]), dtype=np.uint8)
+        for label_value, class_idx in self.label_values:
+            class_mask = (label_array == label_value).all(axis=-1)
+            mask_array[class_mask] = class_idx
+        mask = Image.fromarray(mask_array, mode='L')  # single mode array (PIL.Image) compatbile with torchvision transform API
+
         outputs = {}
 
-        if self.model_name == 'pidnet':
-            edge = generate_edge(np.array(label))
+        if self._is_pidnet:
+            edge = generate_edge(mask_array)
             out = self.transform(image=img, mask=mask, edge=edge)
             outputs.update({'pixel_values': out['image'], 'labels': out['mask'], 'edges': out['edge'].float(), 'name': img_name})
         else:
@@ -288,10 +310,9 @@ class SegmentationHFDataset(BaseHFDataset):
             outputs.update({'pixel_values': out['image'], 'labels': out['mask'], 'name': img_name})
 
         outputs.update({'indices': index})
-        if self._split in ['train', 'training']:
+        if self._is_train:
             return outputs
 
-        assert self._split in ['val', 'valid', 'test']
         # outputs.update({'org_img': org_img, 'org_shape': (h, w)})  # TODO: return org_img with batch_size > 1
         outputs.update({'org_shape': (h, w)})
         return outputs
@@ -80,6 +80,7 @@ def create_loader(
         tf_preprocessing=False,
         use_multi_epochs_loader=False,
         persistent_workers=True,
+        prefetch_factor=2,
         worker_seeding='all',
         world_size=1,
         rank=0,
@@ -103,12 +104,14 @@ def create_loader(
         'pin_memory': pin_memory,
         'drop_last': is_training,
         'worker_init_fn': partial(init_worker, worker_seeding=worker_seeding),
-        'persistent_workers': persistent_workers
     }
+    # Worker-only options, DataLoader rejects them when loading in the main process
+    if num_workers > 0:
+        loader_args.update({'persistent_workers': persistent_workers, 'prefetch_factor': prefetch_factor})
     try:
         loader = DataLoader(dataset, **loader_args)
     except TypeError:
-        loader_args.pop('persistent_workers')  # only in Pytorch 1.7+
+        loader_args.pop('persistent_workers', None)  # only in Pytorch 1.7+
         loader = DataLoader(dataset, **loader_args)
 
     return loader
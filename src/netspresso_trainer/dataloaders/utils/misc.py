@@ -1,5 +1,6 @@
 import csv
 import json
+import os
 import re
 from itertools import repeat
 from pathlib import Path
@@ -7,6 +8,11 @@ from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
 
+from .constants import IMG_EXTENSIONS
+
+IMG_EXTENSIONS_LOWER = frozenset(ext.lower() for ext in IMG_EXTENSIONS)
+NATURAL_KEY_PATTERN = re.compile(r'(\d+)')
+
 
 def read_json(json_path):
     with open(json_path, 'r') as f:
@@ -24,9 +30,16 @@ def expand_to_chs(x, n):
     return x
 
 
+def list_image_files(directory: Union[Path, str]) -> List[str]:
+    """List image files of ``directory`` with a single directory scan, matching extensions case-insensitively."""
+    with os.scandir(directory) as it:
+        return [entry.path for entry in it
+                if os.path.splitext(entry.name)[1].lower() in IMG_EXTENSIONS_LOWER and entry.is_file()]
+
+
 def natural_key(string_):
     """See http://www.codinghorror.com/blog/archives/001018.html"""
-    return [int(s) if s.isdigit() else s for s in re.split(r'(\d+)', string_.lower())]
+    return [int(s) if s.isdigit() else s for s in NATURAL_KEY_PATTERN.split(string_.lower())]
 
 
 def get_detection_label(label_file: Path):
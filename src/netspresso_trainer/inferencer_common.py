@@ -7,7 +7,7 @@ from omegaconf import DictConfig
 from torch.nn.parallel import DistributedDataParallel as DDP
 
 from .dataloaders import build_dataloader, build_dataset
-from .models import SUPPORTING_TASK_LIST, build_model, is_single_task_model
+from .models import SUPPORTING_TASK_LIST, build_model, fuse_conv_and_norm, is_single_task_model
 from .pipelines import build_pipeline
 from .utils.environment import set_device
 from .utils.logger import add_file_handler, set_logger
@@ -24,7 +24,9 @@ def inference_common(
     inference_supports = ['classification', 'detection', 'segmentation']
     assert task in inference_supports, f"Sorry. Inference mode only supports {inference_supports}"
 
-    distributed, world_size, rank, devices = set_device(conf.environment.seed)
+    #TODO: Temporarily set ``cudnn_benchmark`` as optional since this is experimental
+    cudnn_benchmark = conf.environment.cudnn_benchmark if hasattr(conf.environment, 'cudnn_benchmark') else False
+    distributed, world_size, rank, devices = set_device(conf.environment.seed, cudnn_benchmark=cudnn_benchmark)
     logger = set_logger(level=log_level, distributed=distributed)
 
     conf.distributed = distributed
@@ -59,6 +61,8 @@ def inference_common(
         model_checkpoint=conf.model.checkpoint.path,
         use_pretrained=conf.model.checkpoint.use_pretrained,
     )
+    # Model is only used for inference here, so batch normalization can be folded into convolutions
+    model = fuse_conv_and_norm(model)
 
     model = model.to(device=devices)
     if conf.distributed:
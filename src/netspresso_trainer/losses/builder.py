@@ -17,7 +17,12 @@ class LossFactory:
         self._build_losses(**kwargs)
 
         self._dirty_backward: bool = False
-        self.loss_val_per_epoch: Dict[str, Dict[str, AverageMeter]] = {}
+        self.loss_val_per_epoch: Dict[str, Dict[str, AverageMeter]] = {
+            phase: {
+                loss_key: AverageMeter(loss_key, ':.4e') for loss_key in chain(self.loss_func_dict.keys(), ['total'])
+            }
+            for phase in PHASE_LIST
+        }
         self._clear_epoch_start()
 
     def _build_losses(self, **kwargs):
@@ -36,12 +41,8 @@ class LossFactory:
         self._dirty_backward = False
 
     def _clear_epoch_start(self):
-        self.loss_val_per_epoch = {
-            phase: {
-                loss_key: AverageMeter(loss_key, ':.4e') for loss_key in chain(self.loss_func_dict.keys(), ['total'])
-            }
-            for phase in PHASE_LIST
-        }
+        for phase in PHASE_LIST:
+            [meter.reset() for _, meter in self.loss_val_per_epoch[phase].items()]
         self._clear_step_start()
 
     def _assert_argument(self, kwargs):
@@ -55,7 +56,7 @@ class LossFactory:
 
     def result(self, phase='train'):
         phase = phase.lower()
-        return self.loss_val_per_epoch[phase]
+        return {loss_key: meter.avg for loss_key, meter in self.loss_val_per_epoch[phase].items()}
 
     def reset_values(self):
         self._clear_epoch_start()
@@ -1,6 +1,7 @@
 from typing import Any, Dict
 
 import torch
+import torch.distributed as dist
 
 from .registry import PHASE_LIST, TASK_METRIC
 
@@ -28,6 +29,17 @@ class MetricFactory:
         phase = phase.lower()
         self.metrics[phase].calibrate(pred, target)
 
+    def all_reduce(self, phase: str, device: torch.device) -> None:
+        """Sum the meters of every rank, so that each rank holds the metrics over the whole dataset."""
+        phase = phase.lower()
+        meters = list(self.metrics[phase].metric_meter.values())
+        stats = torch.tensor([[meter.sum, meter.count] for meter in meters], dtype=torch.float64, device=device)
+        dist.all_reduce(stats, op=dist.ReduceOp.SUM)
+        for meter, (total_sum, total_count) in zip(meters, stats.tolist()):
+            meter.reset()
+            if total_count > 0:
+                meter.update(total_sum, n=int(total_count))
+
     def result(self, phase='train'):
         return {metric_name: meter.avg for metric_name, meter in self.metrics[phase].metric_meter.items()}
 
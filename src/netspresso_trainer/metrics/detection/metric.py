@@ -174,9 +174,11 @@ class DetectionMetric(BaseMetric):
         assert set(metric_names).issubset(DetectionMetric.SUPPORT_METRICS)
         super().__init__(metric_names=metric_names, primary_metric=primary_metric)
 
-    def calibrate(self, predictions, targets, **kwargs):
-        result_dict = {k: 0. for k in self.metric_names}
+    def matching_stats(self, predictions, targets) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """Match the predictions of each image with its targets.
 
+        Stats of different images (or ranks) can be concatenated and passed to ``calibrate_with_stats``.
+        """
         iou_thresholds = np.linspace(0.5, 0.95, 10)
         stats = []
 
@@ -208,20 +210,22 @@ class DetectionMetric(BaseMetric):
                     )
                 )
 
+        return stats
+
+    def calibrate_with_stats(self, stats):
         # Compute average precisions if any matches exist
         if stats:
             concatenated_stats = [np.concatenate(items, 0) for items in zip(*stats)]
             average_precisions = average_precisions_per_class(*concatenated_stats)
-            #result_dict['map50'] = average_precisions[:, 0].mean()
-            #result_dict['map75'] = average_precisions[:, 5].mean()
-            #result_dict['map50_95'] = average_precisions.mean()
             self.metric_meter['map50'].update(average_precisions[:, 0].mean())
             self.metric_meter['map75'].update(average_precisions[:, 5].mean())
             self.metric_meter['map50_95'].update(average_precisions.mean())
         else:
-            #result_dict['map50'], result_dict['map75'], result_dict['map50_95'] = 0, 0, 0
             self.metric_meter['map50'].update(0)
             self.metric_meter['map75'].update(0)
             self.metric_meter['map50_95'].update(0)
 
+    def calibrate(self, predictions, targets, **kwargs):
+        result_dict = {k: 0. for k in self.metric_names}
+        self.calibrate_with_stats(self.matching_stats(predictions, targets))
         return result_dict
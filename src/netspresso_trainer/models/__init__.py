@@ -1,3 +1,3 @@
 from .builder import build_model
 from .registry import MODEL_BACKBONE_DICT, MODEL_FULL_DICT, SUPPORTING_MODEL_LIST, SUPPORTING_TASK_LIST
-from .utils import is_single_task_model
+from .utils import fuse_conv_and_norm, is_single_task_model
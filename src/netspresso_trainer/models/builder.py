@@ -1,13 +1,7 @@
-import os
-from pathlib import Path
-from typing import Callable, Dict, List, Type
+from typing import Callable
 
-import torch
 import torch.nn as nn
-from loguru import logger
-from omegaconf import OmegaConf
 
-from .base import ClassificationModel, DetectionModel, SegmentationModel, TaskModel
 from .registry import (
     MODEL_BACKBONE_DICT,
     MODEL_FULL_DICT,
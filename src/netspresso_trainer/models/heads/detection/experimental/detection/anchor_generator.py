@@ -1,9 +1,10 @@
-from typing import List
+from typing import List, Optional, Tuple
 
 from omegaconf import ListConfig
 import torch
 import torch.nn as nn
 from torch import Tensor
+from torch.fx import Proxy
 
 
 class AnchorGenerator(nn.Module):
@@ -52,6 +53,8 @@ class AnchorGenerator(nn.Module):
         ]
         
         self.image_size = image_size
+        # (grid sizes, device, dtype) of the feature maps anchors_over_all_feature_maps were computed for
+        self._anchors_key: Optional[Tuple] = None
         self.anchors_over_all_feature_maps = None
 
     # TODO: https://github.com/pytorch/pytorch/issues/26792
@@ -84,7 +87,7 @@ class AnchorGenerator(nn.Module):
 
     # For every combination of (a, (g, s), i) in (self.cell_anchors, zip(grid_sizes, strides), 0:2),
     # output g[i] anchors that are s[i] distance apart in direction i, with the same dimensions as a.
-    def grid_anchors(self, cell_anchors, grid_templates, grid_sizes: List[List[int]], strides: List[List[Tensor]]) -> List[Tensor]:
+    def grid_anchors(self, cell_anchors, grid_sizes: List[List[int]], strides: List[List[int]]) -> List[Tensor]:
         anchors = []
         cell_anchors = cell_anchors
         torch._assert(cell_anchors is not None, "cell_anchors should not be None")
@@ -96,15 +99,14 @@ class AnchorGenerator(nn.Module):
             "feature maps passed and the number of sizes / aspect ratios specified.",
         )
 
-        for grid_template, size, stride, base_anchors in zip(grid_templates, grid_sizes, strides, cell_anchors):
-            grid_height_template, grid_width_template = grid_template
+        for size, stride, base_anchors in zip(grid_sizes, strides, cell_anchors):
             grid_height, grid_width = size
             stride_height, stride_width = stride
             device = base_anchors.device
 
             # For output anchor, compute [x_center, y_center, x_center, y_center]
-            shifts_x = torch.arange(0, grid_width, dtype=torch.int32).to(device) * stride_width
-            shifts_y = torch.arange(0, grid_height, dtype=torch.int32).to(device) * stride_height
+            shifts_x = torch.arange(0, grid_width, dtype=torch.int32, device=device) * stride_width
+            shifts_y = torch.arange(0, grid_height, dtype=torch.int32, device=device) * stride_height
             shift_y, shift_x = torch.meshgrid(shifts_y, shifts_x, indexing="ij")
             shift_x = shift_x.reshape(-1)
             shift_y = shift_y.reshape(-1)
@@ -119,22 +121,19 @@ class AnchorGenerator(nn.Module):
     def forward(self, feature_maps: List[Tensor]) -> List[Tensor]:
         # TODO: Use constant anchor for fx transform
         # This forces inference image size same with training phase.
-        if self.anchors_over_all_feature_maps:
+        if self.anchors_over_all_feature_maps and isinstance(feature_maps[0], Proxy):
             return self.anchors_over_all_feature_maps
 
-        grid_sizes = [feature_map.shape[-2:] for feature_map in feature_maps]
         # each feature_map has (b, c, h, w) shape
-        grid_templates = [(feature_map[0, 0, :, 0], feature_map[0, 0, 0, :]) for feature_map in feature_maps]
+        grid_sizes = tuple(tuple(feature_map.shape[-2:]) for feature_map in feature_maps)
         dtype, device = feature_maps[0].dtype, feature_maps[0].device
-        strides = [
-            [
-                torch.empty(1, dtype=torch.int64).fill_(self.image_size[0] // g[0]).to(device),
-                torch.empty(1, dtype=torch.int64).fill_(self.image_size[1] // g[1]).to(device),
-            ]
-            for g in grid_sizes
-        ]
-        cell_anchors = self.set_cell_anchors(dtype, device)
-        anchors_over_all_feature_maps = self.grid_anchors(cell_anchors, grid_templates, grid_sizes, strides)
-
-        self.anchors_over_all_feature_maps = anchors_over_all_feature_maps
-        return anchors_over_all_feature_maps
+        # Anchors only depend on feature map sizes, so reuse the last ones while the input configuration is unchanged.
+        # Only the most recent anchors are kept, so multi-scale training or evaluation at another size doesn't pile up.
+        anchors_key = (grid_sizes, device, dtype)
+        if anchors_key != self._anchors_key or self.anchors_over_all_feature_maps is None:
+            strides = [[self.image_size[0] // g[0], self.image_size[1] // g[1]] for g in grid_sizes]
+            cell_anchors = self.set_cell_anchors(dtype, device)
+            self.anchors_over_all_feature_maps = self.grid_anchors(cell_anchors, grid_sizes, strides)
+            self._anchors_key = anchors_key
+
+        return self.anchors_over_all_feature_maps
@@ -17,6 +17,9 @@ class FPN(nn.Module):
         upsample_cfg = {'mode': 'nearest'}
         self.upsample_cfg = upsample_cfg.copy()
         super(FPN, self).__init__()
+        # In some cases, fixing `scale factor` (e.g. 2) is preferred, but
+        #  it cannot co-exist with `size` in `F.interpolate`.
+        self.upsample_with_scale_factor = 'scale_factor' in self.upsample_cfg
 
         self.in_channels = intermediate_features_dim
         self.out_channels = intermediate_features_dim[-1]
@@ -74,7 +77,8 @@ class FPN(nn.Module):
             self.fpn_convs.append(fpn_conv)
 
         # add extra conv layers (e.g., RetinaNet)
-        extra_levels = self.num_outs - self.backbone_end_level + self.start_level
+        self.num_backbone_levels = self.backbone_end_level - self.start_level
+        extra_levels = self.num_outs - self.num_backbone_levels
         if self.add_extra_convs and extra_levels >= 1:
             for i in range(extra_levels):
                 if i == 0 and self.add_extra_convs == 'on_input':
@@ -97,11 +101,9 @@ class FPN(nn.Module):
         ]
 
         # build top-down path
-        used_backbone_levels = len(laterals)
+        used_backbone_levels = self.num_backbone_levels
         for i in range(used_backbone_levels - 1, 0, -1):
-            # In some cases, fixing `scale factor` (e.g. 2) is preferred, but
-            #  it cannot co-exist with `size` in `F.interpolate`.
-            if 'scale_factor' in self.upsample_cfg:
+            if self.upsample_with_scale_factor:
                 # fix runtime error of "+=" inplace operation in PyTorch 1.10
                 laterals[i - 1] = laterals[i - 1] + F.interpolate(
                     laterals[i], **self.upsample_cfg)
@@ -110,18 +112,19 @@ class FPN(nn.Module):
                 laterals[i - 1] = laterals[i - 1] + F.interpolate(
                     laterals[i], size=prev_shape, **self.upsample_cfg)
 
-        # build outputs
+        # build outputs, the number of levels is fixed so fill them by index
+        outs = [None] * self.num_outs
         # part 1: from original levels
-        outs = [
-            self.fpn_convs[i](laterals[i]) for i in range(used_backbone_levels)
-        ]
+        for i in range(used_backbone_levels):
+            outs[i] = self.fpn_convs[i](laterals[i])
         # part 2: add extra levels
-        if self.num_outs > len(outs):
-            # use max pool to get more levels on top of outputs
+        if self.num_outs > used_backbone_levels:
+            # subsample outputs to get more levels on top of them
             # (e.g., Faster R-CNN, Mask R-CNN)
             if not self.add_extra_convs:
-                for i in range(self.num_outs - used_backbone_levels):
-                    outs.append(F.max_pool2d(outs[-1], 1, stride=2))
+                # same as max pool with kernel 1 and stride 2, but as a view without a kernel launch
+                for i in range(used_backbone_levels, self.num_outs):
+                    outs[i] = outs[i - 1][:, :, ::2, ::2]
             # add conv layers on top of original feature maps (RetinaNet)
             else:
                 if self.add_extra_convs == 'on_input':
@@ -129,15 +132,15 @@ class FPN(nn.Module):
                 elif self.add_extra_convs == 'on_lateral':
                     extra_source = laterals[-1]
                 elif self.add_extra_convs == 'on_output':
-                    extra_source = outs[-1]
+                    extra_source = outs[used_backbone_levels - 1]
                 else:
                     raise NotImplementedError
-                outs.append(self.fpn_convs[used_backbone_levels](extra_source))
+                outs[used_backbone_levels] = self.fpn_convs[used_backbone_levels](extra_source)
                 for i in range(used_backbone_levels + 1, self.num_outs):
                     if self.relu_before_extra_convs:
-                        outs.append(self.fpn_convs[i](F.relu(outs[-1])))
+                        outs[i] = self.fpn_convs[i](F.relu(outs[i - 1]))
                     else:
-                        outs.append(self.fpn_convs[i](outs[-1]))
+                        outs[i] = self.fpn_convs[i](outs[i - 1])
         return BackboneOutput(intermediate_features=outs)
     
     @property
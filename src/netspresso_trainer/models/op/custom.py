@@ -8,6 +8,7 @@ import torch
 import torch.nn as nn
 from torch import Tensor
 from torch.fx.proxy import Proxy
+from torch.nn.utils.fusion import fuse_conv_bn_eval
 from torchvision.ops.misc import SqueezeExcitation as SElayer
 
 from ..op.registry import ACTIVATION_REGISTRY, NORM_REGISTRY
@@ -117,6 +118,14 @@ class ConvLayer(nn.Module):
     def forward(self, x: Union[Tensor, Proxy]) -> Union[Tensor, Proxy]:
         return self.block(x)
 
+    def fuse(self) -> None:
+        """Fold batch normalization into the convolution. This is only valid for a model in eval mode."""
+        if not isinstance(getattr(self.block, 'norm', None), nn.BatchNorm2d):
+            return
+        self.block.conv = fuse_conv_bn_eval(self.block.conv, self.block.norm)
+        self.block.norm = nn.Identity()
+        self.norm_name = None
+
     def __repr__(self):
         return f"{self.block}"
 
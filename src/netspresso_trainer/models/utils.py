@@ -9,6 +9,7 @@ from torch import Tensor
 from torch.fx.proxy import Proxy
 
 from ..utils.checkpoint import load_checkpoint
+from .op.custom import ConvLayer
 
 FXTensorType = Union[Tensor, Proxy]
 FXTensorListType = Union[List[Tensor], List[Proxy]]
@@ -175,3 +176,11 @@ def is_single_task_model(conf_model: omegaconf.DictConfig):
     if conf_model_architecture_full.name is None:
         return False
     return True
+
+
+def fuse_conv_and_norm(model: nn.Module) -> nn.Module:
+    """Fold batch normalization of every ``ConvLayer`` in ``model`` into its convolution for inference."""
+    model.eval()
+    for module in [m for m in model.modules() if isinstance(m, ConvLayer)]:
+        module.fuse()
+    return model
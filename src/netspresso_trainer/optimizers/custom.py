@@ -1,6 +1,12 @@
+import torch
 import torch.optim as optim
 
 
+def _use_foreach(optimizer_conf) -> bool:
+    # Multi-tensor (foreach) update runs each op over all parameters at once, instead of looping per parameter
+    return optimizer_conf.foreach if hasattr(optimizer_conf, 'foreach') else torch.cuda.is_available()
+
+
 class Adadelta(optim.Adadelta):
     def __init__(
         self,
@@ -10,8 +16,9 @@ class Adadelta(optim.Adadelta):
         lr = optimizer_conf.lr
         rho = optimizer_conf.rho
         weight_decay = optimizer_conf.weight_decay
+        foreach = _use_foreach(optimizer_conf)
 
-        super().__init__(params=params, lr=lr, rho=rho, weight_decay=weight_decay)
+        super().__init__(params=params, lr=lr, rho=rho, weight_decay=weight_decay, foreach=foreach)
 
 
 class Adagrad(optim.Adagrad):
@@ -23,8 +30,9 @@ class Adagrad(optim.Adagrad):
         lr = optimizer_conf.lr
         lr_decay = optimizer_conf.lr_decay
         weight_decay = optimizer_conf.weight_decay
+        foreach = _use_foreach(optimizer_conf)
 
-        super().__init__(params=params, lr=lr, lr_decay=lr_decay, weight_decay=weight_decay)
+        super().__init__(params=params, lr=lr, lr_decay=lr_decay, weight_decay=weight_decay, foreach=foreach)
 
 
 class Adam(optim.Adam):
@@ -36,8 +44,9 @@ class Adam(optim.Adam):
         lr = optimizer_conf.lr
         betas = optimizer_conf.betas
         weight_decay = optimizer_conf.weight_decay
+        foreach = _use_foreach(optimizer_conf)
 
-        super().__init__(params=params, lr=lr, betas=betas, weight_decay=weight_decay)
+        super().__init__(params=params, lr=lr, betas=betas, weight_decay=weight_decay, foreach=foreach)
 
 
 class Adamax(optim.Adamax):
@@ -49,8 +58,9 @@ class Adamax(optim.Adamax):
         lr = optimizer_conf.lr
         betas = optimizer_conf.betas
         weight_decay = optimizer_conf.weight_decay
+        foreach = _use_foreach(optimizer_conf)
 
-        super().__init__(params=params, lr=lr, betas=betas, weight_decay=weight_decay)
+        super().__init__(params=params, lr=lr, betas=betas, weight_decay=weight_decay, foreach=foreach)
 
 
 class AdamW(optim.AdamW):
@@ -62,8 +72,9 @@ class AdamW(optim.AdamW):
         lr = optimizer_conf.lr
         betas = optimizer_conf.betas
         weight_decay = optimizer_conf.weight_decay
+        foreach = _use_foreach(optimizer_conf)
 
-        super().__init__(params=params, lr=lr, betas=betas, weight_decay=weight_decay)
+        super().__init__(params=params, lr=lr, betas=betas, weight_decay=weight_decay, foreach=foreach)
 
 
 class RMSprop(optim.RMSprop):
@@ -77,8 +88,9 @@ class RMSprop(optim.RMSprop):
         weight_decay = optimizer_conf.weight_decay
         momentum = optimizer_conf.momentum
         eps = optimizer_conf.eps
+        foreach = _use_foreach(optimizer_conf)
 
-        super().__init__(params=params, lr=lr, alpha=alpha, weight_decay=weight_decay, momentum=momentum, eps=eps)
+        super().__init__(params=params, lr=lr, alpha=alpha, weight_decay=weight_decay, momentum=momentum, eps=eps, foreach=foreach)
 
 
 class SGD(optim.SGD):
@@ -91,5 +103,6 @@ class SGD(optim.SGD):
         momentum = optimizer_conf.momentum
         weight_decay = optimizer_conf.weight_decay
         nesterov = optimizer_conf.nesterov
+        foreach = _use_foreach(optimizer_conf)
 
-        super().__init__(params=params, lr=lr, momentum=momentum, weight_decay=weight_decay, nesterov=nesterov)
+        super().__init__(params=params, lr=lr, momentum=momentum, weight_decay=weight_decay, nesterov=nesterov, foreach=foreach)
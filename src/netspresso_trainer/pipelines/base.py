@@ -2,8 +2,10 @@ from abc import ABC, abstractmethod
 from typing import Dict, List, Literal, Optional
 
 import torch
+import torch.distributed as dist
 import torch.nn as nn
 from omegaconf import DictConfig
+from tqdm import tqdm
 
 from ..loggers.base import TrainingLogger
 from ..utils.record import Timer
@@ -28,12 +30,27 @@ class BasePipeline(ABC):
         self.model_name = model_name
         self.save_dtype = next(model.parameters()).dtype
         self.model = model.float()
+        # Model without the DDP wrapper, resolved once for EMA updates and saving
+        self.unwrapped_model = self.model.module if hasattr(self.model, 'module') else self.model
         self.logger = logger
         self.timer = timer
+        self._sample_input = None
+
+        # Progress bar adds per-step overhead, so it is shown only if requested and only on the main process
+        self.progress_bar = conf.logging.progress_bar if hasattr(conf.logging, 'progress_bar') else False
+        self.progress_bar = self.progress_bar and ((not conf.distributed) or (conf.distributed and dist.get_rank() == 0))
 
     @property
     def sample_input(self):
-        return torch.randn((1, 3, self.conf.logging.onnx_input_size[0], self.conf.logging.onnx_input_size[1]))
+        # Built on first access and reused for every ONNX export and MACs count
+        if self._sample_input is None:
+            self._sample_input = torch.randn((1, 3, self.conf.logging.onnx_input_size[0], self.conf.logging.onnx_input_size[1]))
+        return self._sample_input
+
+    def wrap_progress_bar(self, dataloader):
+        if self.progress_bar:
+            return tqdm(dataloader, leave=False, mininterval=1.0, miniters=50)
+        return dataloader
 
     def log_results(
         self,
@@ -9,7 +9,6 @@ import torch.nn as nn
 from loguru import logger
 from omegaconf import DictConfig
 from torch.utils.data import DataLoader
-from tqdm import tqdm
 
 from ..loggers.base import TrainingLogger
 from ..losses.builder import LossFactory
@@ -50,9 +49,8 @@ class EvaluationPipeline(BasePipeline):
 
     @property
     def valid_loss(self):
-        return self.loss_factory.result('valid').get('total').avg
+        return self.loss_factory.result('valid').get('total')
 
-    @torch.no_grad()
     def evaluation(self, num_samples=NUM_SAMPLES):
         self._is_ready()
         self.timer.start_record(name='evaluation')
@@ -60,14 +58,21 @@ class EvaluationPipeline(BasePipeline):
         num_returning_samples = 0
         returning_samples = []
         outputs = []
-        for _idx, batch in enumerate(tqdm(self.eval_dataloader, leave=False)):
-            out = self.task_processor.valid_step(self.model, batch, self.loss_factory, self.metric_factory)
-            if out is not None:
-                outputs.append(out)
-                if num_returning_samples < num_samples:
-                    returning_samples.append(out)
-                    num_returning_samples += len(out['pred'])
-        self.task_processor.get_metric_with_all_outputs(outputs, phase='valid', metric_factory=self.metric_factory)
+        # Summary is saved outside of inference mode, since MACs counting traces the model with torch.jit
+        with torch.inference_mode():
+            for _idx, batch in enumerate(self.wrap_progress_bar(self.eval_dataloader)):
+                out = self.task_processor.valid_step(self.model, batch, self.loss_factory, self.metric_factory)
+                if out is not None:
+                    if num_returning_samples < num_samples:
+                        # Images are kept on the device by ``valid_step``, copy them to host only for the returning samples
+                        out['images'] = out['images'].cpu().numpy()
+                        returning_samples.append(out)
+                        num_returning_samples += len(out['pred'])
+                    else:
+                        # Images are only needed for the returning samples, don't keep them for the whole dataset
+                        out.pop('images', None)
+                    outputs.append(out)
+            self.task_processor.get_metric_with_all_outputs(outputs, phase='valid', metric_factory=self.metric_factory)
 
         self.timer.end_record(name='evaluation')
         if self.single_gpu_or_rank_zero:
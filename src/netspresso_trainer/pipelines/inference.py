@@ -9,7 +9,6 @@ import torch.nn as nn
 from loguru import logger
 from omegaconf import DictConfig
 from torch.utils.data import DataLoader
-from tqdm import tqdm
 
 from ..loggers.base import TrainingLogger
 from ..utils.record import InferenceSummary, Timer
@@ -42,7 +41,6 @@ class InferencePipeline(BasePipeline):
         assert self.model is not None, "`self.model` is not defined!"
         return True
 
-    @torch.no_grad()
     def inference(self):
         self._is_ready()
         self.timer.start_record(name='inference')
@@ -50,13 +48,20 @@ class InferencePipeline(BasePipeline):
         num_returning_samples = 0
         returning_samples = []
         outputs = []
-        for _idx, batch in enumerate(tqdm(self.test_dataloader, leave=False)):
-            out = self.task_processor.test_step(self.model, batch)
-            if out is not None:
-                outputs.append(out)
-                if num_returning_samples < NUM_SAMPLES: # TODO: Save all output or set by config
-                    returning_samples.append(out)
-                    num_returning_samples += len(out['pred'])
+        # Summary is saved outside of inference mode, since MACs counting traces the model with torch.jit
+        with torch.inference_mode():
+            for _idx, batch in enumerate(self.wrap_progress_bar(self.test_dataloader)):
+                out = self.task_processor.test_step(self.model, batch)
+                if out is not None:
+                    if num_returning_samples < NUM_SAMPLES: # TODO: Save all output or set by config
+                        # Images are kept on the device by ``test_step``, copy them to host only for the returning samples
+                        out['images'] = out['images'].cpu().numpy()
+                        returning_samples.append(out)
+                        num_returning_samples += len(out['pred'])
+                    else:
+                        # Images are only needed for the returning samples, don't keep them for the whole dataset
+                        out.pop('images', None)
+                    outputs.append(out)
 
         self.timer.end_record(name='inference')
         if self.single_gpu_or_rank_zero:
@@ -14,13 +14,21 @@ class BaseTaskProcessor(ABC):
         self.conf = conf
         self.postprocessor = postprocessor
         self.devices = devices
-        self.single_gpu_or_rank_zero = (not conf.distributed) or (conf.distributed and dist.get_rank() == 0)
+        # Query the process group once, these are read on every step
+        if conf.distributed:
+            self.world_size = dist.get_world_size()
+            self.rank = dist.get_rank()
+        else:
+            self.world_size, self.rank = 1, 0
+        self.single_gpu_or_rank_zero = self.rank == 0
 
         #TODO: Temporarily set ``mixed_precision`` as optional since this is experimental
         if hasattr(conf, 'training'):
             self.mixed_precision = conf.training.mixed_precision if hasattr(conf.training, 'mixed_precision') else False
+            self.channels_last = conf.training.channels_last if hasattr(conf.training, 'channels_last') else False
         else:
             self.mixed_precision = False
+            self.channels_last = False
         if self.mixed_precision:
             if self.single_gpu_or_rank_zero:
                 logger.info("Mixed precision training activated.")
@@ -28,6 +36,8 @@ class BaseTaskProcessor(ABC):
         else:
             self.data_type = torch.float32
         self.grad_scaler = torch.cuda.amp.GradScaler(enabled=self.mixed_precision)
+        # Input images follow the memory format of the model (see ``train_common``)
+        self.memory_format = torch.channels_last if self.channels_last else torch.preserve_format
 
     @abstractmethod
     def train_step(self, train_model, batch):
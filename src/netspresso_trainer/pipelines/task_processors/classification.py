@@ -13,8 +13,8 @@ class ClassificationProcessor(BaseTaskProcessor):
     def train_step(self, train_model, batch, optimizer, loss_factory, metric_factory):
         train_model.train()
         indices, images, labels = batch
-        images = images.to(self.devices).to(self.data_type)
-        labels = labels.to(self.devices).to(self.data_type)
+        images = images.to(self.devices, non_blocking=True, memory_format=self.memory_format).to(self.data_type)
+        labels = labels.to(self.devices, non_blocking=True).to(self.data_type)
         target = {'target': labels}
 
         optimizer.zero_grad()
@@ -32,13 +32,12 @@ class ClassificationProcessor(BaseTaskProcessor):
 
         labels = labels.detach().cpu().numpy() # Change it to numpy before compute metric
         if self.conf.distributed:
-            gathered_pred = [None for _ in range(torch.distributed.get_world_size())]
-            gathered_labels = [None for _ in range(torch.distributed.get_world_size())]
+            gathered_pred = [None for _ in range(self.world_size)]
+            gathered_labels = [None for _ in range(self.world_size)]
 
-            torch.distributed.gather_object(pred, gathered_pred if torch.distributed.get_rank() == 0 else None, dst=0)
-            torch.distributed.gather_object(labels, gathered_labels if torch.distributed.get_rank() == 0 else None, dst=0)
-            torch.distributed.barrier()
-            if torch.distributed.get_rank() == 0:
+            torch.distributed.gather_object(pred, gathered_pred if self.rank == 0 else None, dst=0)
+            torch.distributed.gather_object(labels, gathered_labels if self.rank == 0 else None, dst=0)
+            if self.rank == 0:
                 [metric_factory.update(g_pred, g_labels, phase='train') for g_pred, g_labels in zip(gathered_pred, gathered_labels)]
         else:
             metric_factory.update(pred, labels, phase='train')
@@ -46,12 +45,13 @@ class ClassificationProcessor(BaseTaskProcessor):
     def valid_step(self, eval_model, batch, loss_factory, metric_factory):
         eval_model.eval()
         indices, images, labels = batch
-        images = images.to(self.devices)
-        labels = labels.to(self.devices)
+        images = images.to(self.devices, non_blocking=True, memory_format=self.memory_format)
+        labels = labels.to(self.devices, non_blocking=True)
         target = {'target': labels}
 
-        out = eval_model(images)
-        loss_factory.calc(out, target, phase='valid')
+        with torch.cuda.amp.autocast(enabled=self.mixed_precision):
+            out = eval_model(images)
+            loss_factory.calc(out, target, phase='valid')
         if labels.dim() > 1: # Soft label to label number
             labels = torch.argmax(labels, dim=-1)
         pred = self.postprocessor(out)
@@ -59,23 +59,22 @@ class ClassificationProcessor(BaseTaskProcessor):
         indices = indices.numpy()
         labels = labels.detach().cpu().numpy() # Change it to numpy before compute metric
         if self.conf.distributed:
-            gathered_pred = [None for _ in range(torch.distributed.get_world_size())]
-            gathered_labels = [None for _ in range(torch.distributed.get_world_size())]
+            gathered_pred = [None for _ in range(self.world_size)]
+            gathered_labels = [None for _ in range(self.world_size)]
 
             # Remove dummy samples, they only come in distributed environment
             pred = pred[indices != -1]
             labels = labels[indices != -1]
-            torch.distributed.gather_object(pred, gathered_pred if torch.distributed.get_rank() == 0 else None, dst=0)
-            torch.distributed.gather_object(labels, gathered_labels if torch.distributed.get_rank() == 0 else None, dst=0)
-            torch.distributed.barrier()
-            if torch.distributed.get_rank() == 0:
+            torch.distributed.gather_object(pred, gathered_pred if self.rank == 0 else None, dst=0)
+            torch.distributed.gather_object(labels, gathered_labels if self.rank == 0 else None, dst=0)
+            if self.rank == 0:
                 [metric_factory.update(g_pred, g_labels, phase='valid') for g_pred, g_labels in zip(gathered_pred, gathered_labels)]
         else:
             metric_factory.update(pred, labels, phase='valid')
 
         if self.single_gpu_or_rank_zero:
             results = {
-                'images': images.detach().cpu().numpy(),
+                'images': images.detach(),
                 'pred': pred
             }
             return results
@@ -83,26 +82,25 @@ class ClassificationProcessor(BaseTaskProcessor):
     def test_step(self, test_model, batch):
         test_model.eval()
         indices, images, _ = batch
-        images = images.to(self.devices)
+        images = images.to(self.devices, non_blocking=True, memory_format=self.memory_format)
 
         out = test_model(images)
         pred = self.postprocessor(out, k=1)
 
         indices = indices.numpy()
         if self.conf.distributed:
-            gathered_pred = [None for _ in range(torch.distributed.get_world_size())]
+            gathered_pred = [None for _ in range(self.world_size)]
 
             # Remove dummy samples, they only come in distributed environment
             pred = pred[indices != -1]
-            torch.distributed.gather_object(pred, gathered_pred if torch.distributed.get_rank() == 0 else None, dst=0)
-            torch.distributed.barrier()
-            if torch.distributed.get_rank() == 0:
+            torch.distributed.gather_object(pred, gathered_pred if self.rank == 0 else None, dst=0)
+            if self.rank == 0:
                 gathered_pred = np.concatenate(gathered_pred, axis=0)
                 pred = gathered_pred
 
         if self.single_gpu_or_rank_zero:
             results = {
-                'images': images.detach().cpu().numpy(),
+                'images': images.detach(),
                 'pred': pred
             }
             return results
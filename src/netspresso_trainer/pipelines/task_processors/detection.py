@@ -1,5 +1,6 @@
 from typing import Literal
 
+import numpy as np
 import torch
 
 from .base import BaseTaskProcessor
@@ -13,8 +14,8 @@ class DetectionProcessor(BaseTaskProcessor):
     def train_step(self, train_model, batch, optimizer, loss_factory, metric_factory):
         train_model.train()
         images, labels, bboxes = batch['pixel_values'], batch['label'], batch['bbox']
-        images = images.to(self.devices)
-        targets = [{"boxes": box.to(self.devices), "labels": label.to(self.devices),}
+        images = images.to(self.devices, non_blocking=True, memory_format=self.memory_format)
+        targets = [{"boxes": box.to(self.devices, non_blocking=True), "labels": label.to(self.devices, non_blocking=True),}
                    for box, label in zip(bboxes, labels)]
 
         targets = {'gt': targets,
@@ -33,91 +34,54 @@ class DetectionProcessor(BaseTaskProcessor):
 
         pred = self.postprocessor(out, original_shape=images[0].shape)
 
-        if self.conf.distributed:
-            gathered_bboxes = [None for _ in range(torch.distributed.get_world_size())]
-            gathered_labels = [None for _ in range(torch.distributed.get_world_size())]
-            gathered_pred = [None for _ in range(torch.distributed.get_world_size())]
-            torch.distributed.gather_object(bboxes, gathered_bboxes if torch.distributed.get_rank() == 0 else None, dst=0)
-            torch.distributed.gather_object(labels, gathered_labels if torch.distributed.get_rank() == 0 else None, dst=0)
-            torch.distributed.gather_object(pred, gathered_pred if torch.distributed.get_rank() == 0 else None, dst=0)
-            torch.distributed.barrier()
-            if torch.distributed.get_rank() == 0:
-                gathered_bboxes = sum(gathered_bboxes, [])
-                gathered_labels = sum(gathered_labels, [])
-                gathered_pred = sum(gathered_pred, [])
-                bboxes = gathered_bboxes
-                labels = gathered_labels
-                pred = gathered_pred
-
-        if self.single_gpu_or_rank_zero:
-            logs = {
-                'target': [(bbox.detach().cpu().numpy(), label.detach().cpu().numpy())
-                        for bbox, label in zip(bboxes, labels)],
-                'pred': pred
-            }
-            return dict(logs.items())
+        # Every rank keeps its own outputs, they are matched locally and gathered in ``get_metric_with_all_outputs``
+        logs = {
+            # Targets are the host tensors from the batch, only their device copies went to the model
+            'target': [(bbox.numpy(), label.numpy()) for bbox, label in zip(bboxes, labels)],
+            'pred': pred
+        }
+        return dict(logs.items())
 
     def valid_step(self, eval_model, batch, loss_factory, metric_factory):
         eval_model.eval()
         indices, images, labels, bboxes = batch['indices'], batch['pixel_values'], batch['label'], batch['bbox']
-        images = images.to(self.devices)
-        targets = [{"boxes": box.to(self.devices), "labels": label.to(self.devices)}
+        images = images.to(self.devices, non_blocking=True, memory_format=self.memory_format)
+        targets = [{"boxes": box.to(self.devices, non_blocking=True), "labels": label.to(self.devices, non_blocking=True)}
                    for box, label in zip(bboxes, labels)]
 
         targets = {'gt': targets,
                    'img_size': images.size(-1),
                    'num_classes': self.num_classes,}
 
-        out = eval_model(images)
-        loss_factory.calc(out, targets, phase='valid')
+        with torch.cuda.amp.autocast(enabled=self.mixed_precision):
+            out = eval_model(images)
+            loss_factory.calc(out, targets, phase='valid')
 
         pred = self.postprocessor(out, original_shape=images[0].shape)
 
         indices = indices.numpy()
         if self.conf.distributed:
             # Remove dummy samples, they only come in distributed environment
-            images = images[indices != -1]
-            filtered_bboxes = []
-            filtered_labels = []
-            filtered_pred = []
-            for idx, bool_idx in enumerate(indices != -1):
-                if bool_idx:
-                    filtered_bboxes.append(bboxes[idx])
-                    filtered_labels.append(labels[idx])
-                    filtered_pred.append(pred[idx])
-            bboxes = filtered_bboxes
-            labels = filtered_labels
-            pred = filtered_pred
-
-            # Gather phase
-            gathered_bboxes = [None for _ in range(torch.distributed.get_world_size())]
-            gathered_labels = [None for _ in range(torch.distributed.get_world_size())]
-            gathered_pred = [None for _ in range(torch.distributed.get_world_size())]
-            torch.distributed.gather_object(bboxes, gathered_bboxes if torch.distributed.get_rank() == 0 else None, dst=0)
-            torch.distributed.gather_object(labels, gathered_labels if torch.distributed.get_rank() == 0 else None, dst=0)
-            torch.distributed.gather_object(pred, gathered_pred if torch.distributed.get_rank() == 0 else None, dst=0)
-            torch.distributed.barrier()
-            if torch.distributed.get_rank() == 0:
-                gathered_bboxes = sum(gathered_bboxes, [])
-                gathered_labels = sum(gathered_labels, [])
-                gathered_pred = sum(gathered_pred, [])
-                bboxes = gathered_bboxes
-                labels = gathered_labels
-                pred = gathered_pred
-
-        if self.single_gpu_or_rank_zero:
-            logs = {
-                'images': images.detach().cpu().numpy(),
-                'target': [(bbox.detach().cpu().numpy(), label.detach().cpu().numpy())
-                        for bbox, label in zip(bboxes, labels)],
-                'pred': pred
-            }
-            return dict(logs.items())
+            keep = indices != -1
+            keep_idx = np.flatnonzero(keep)
+            images = images[keep]
+            bboxes = [bboxes[idx] for idx in keep_idx]
+            labels = [labels[idx] for idx in keep_idx]
+            pred = [pred[idx] for idx in keep_idx]
+
+        # Every rank keeps its own outputs, they are matched locally and gathered in ``get_metric_with_all_outputs``
+        logs = {
+            'images': images.detach(),
+            # Targets are the host tensors from the batch, only their device copies went to the model
+            'target': [(bbox.numpy(), label.numpy()) for bbox, label in zip(bboxes, labels)],
+            'pred': pred
+        }
+        return dict(logs.items())
 
     def test_step(self, test_model, batch):
         test_model.eval()
         indices, images = batch['indices'], batch['pixel_values']
-        images = images.to(self.devices)
+        images = images.to(self.devices, non_blocking=True, memory_format=self.memory_format)
 
         out = test_model(images)
 
@@ -126,42 +90,50 @@ class DetectionProcessor(BaseTaskProcessor):
         indices = indices.numpy()
         if self.conf.distributed:
             # Remove dummy samples, they only come in distributed environment
-            filtered_pred = []
-            for idx, bool_idx in enumerate(indices != -1):
-                if bool_idx:
-                    filtered_pred.append(pred[idx])
-            pred = filtered_pred
+            pred = [pred[idx] for idx in np.flatnonzero(indices != -1)]
 
             # Gather phase
-            gathered_pred = [None for _ in range(torch.distributed.get_world_size())]
-            torch.distributed.gather_object(pred, gathered_pred if torch.distributed.get_rank() == 0 else None, dst=0)
-            torch.distributed.barrier()
-            if torch.distributed.get_rank() == 0:
+            gathered_pred = [None for _ in range(self.world_size)]
+            torch.distributed.gather_object(pred, gathered_pred if self.rank == 0 else None, dst=0)
+            if self.rank == 0:
                 gathered_pred = sum(gathered_pred, [])
                 pred = gathered_pred
 
         if self.single_gpu_or_rank_zero:
-            results = {'images': images.detach().cpu().numpy(), 'pred': pred}
+            results = {'images': images.detach(), 'pred': pred}
             return results
 
     def get_metric_with_all_outputs(self, outputs, phase: Literal['train', 'valid'], metric_factory):
-        if self.single_gpu_or_rank_zero:
-            pred = []
-            targets = []
-            for output_batch in outputs:
-                if len(output_batch['target']) == 0:
-                    continue
-
-                for detection, class_idx in output_batch['target']:
-                    target_on_image = {}
-                    target_on_image['boxes'] = detection
-                    target_on_image['labels'] = class_idx
-                    targets.append(target_on_image)
-
-                for detection, class_idx in output_batch['pred']:
-                    pred_on_image = {}
-                    pred_on_image['post_boxes'] = detection[..., :4]
-                    pred_on_image['post_scores'] = detection[..., -1]
-                    pred_on_image['post_labels'] = class_idx
-                    pred.append(pred_on_image)
+        pred = []
+        targets = []
+        for output_batch in outputs:
+            if len(output_batch['target']) == 0:
+                continue
+
+            for detection, class_idx in output_batch['target']:
+                target_on_image = {}
+                target_on_image['boxes'] = detection
+                target_on_image['labels'] = class_idx
+                targets.append(target_on_image)
+
+            for detection, class_idx in output_batch['pred']:
+                pred_on_image = {}
+                pred_on_image['post_boxes'] = detection[..., :4]
+                pred_on_image['post_scores'] = detection[..., -1]
+                pred_on_image['post_labels'] = class_idx
+                pred.append(pred_on_image)
+
+        if not self.conf.distributed:
             metric_factory.update(pred, target=targets, phase=phase)
+            return
+
+        # Match boxes on each rank, then gather only the matching stats to compute mAP on rank 0
+        metric = metric_factory.metrics[phase]
+        stats = (len(pred), metric.matching_stats(pred, targets))
+        gathered_stats = [None for _ in range(self.world_size)]
+        torch.distributed.gather_object(stats, gathered_stats if self.rank == 0 else None, dst=0)
+        if self.rank == 0:
+            num_pred = sum(num for num, _ in gathered_stats)
+            if num_pred == 0: # Same as ``MetricFactory.update``, skip if there is no sample
+                return
+            metric.calibrate_with_stats(sum((rank_stats for _, rank_stats in gathered_stats), []))
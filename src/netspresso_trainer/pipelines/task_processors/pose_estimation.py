@@ -13,8 +13,8 @@ class PoseEstimationProcessor(BaseTaskProcessor):
     def train_step(self, train_model, batch, optimizer, loss_factory, metric_factory):
         train_model.train()
         images, keypoints = batch['pixel_values'], batch['keypoints']
-        images = images.to(self.devices)
-        target = {'keypoints': keypoints.to(self.devices)}
+        images = images.to(self.devices, non_blocking=True, memory_format=self.memory_format)
+        target = {'keypoints': keypoints.to(self.devices, non_blocking=True)}
 
         optimizer.zero_grad()
 
@@ -30,13 +30,12 @@ class PoseEstimationProcessor(BaseTaskProcessor):
 
         keypoints = keypoints.detach().cpu().numpy()
         if self.conf.distributed:
-            gathered_pred = [None for _ in range(torch.distributed.get_world_size())]
-            gathered_labels = [None for _ in range(torch.distributed.get_world_size())]
+            gathered_pred = [None for _ in range(self.world_size)]
+            gathered_labels = [None for _ in range(self.world_size)]
 
-            torch.distributed.gather_object(pred, gathered_pred if torch.distributed.get_rank() == 0 else None, dst=0)
-            torch.distributed.gather_object(keypoints, gathered_labels if torch.distributed.get_rank() == 0 else None, dst=0)
-            torch.distributed.barrier()
-            if torch.distributed.get_rank() == 0:
+            torch.distributed.gather_object(pred, gathered_pred if self.rank == 0 else None, dst=0)
+            torch.distributed.gather_object(keypoints, gathered_labels if self.rank == 0 else None, dst=0)
+            if self.rank == 0:
                 pred = np.concatenate(gathered_pred, axis=0)
                 keypoints = np.concatenate(gathered_labels, axis=0)
 
@@ -50,11 +49,12 @@ class PoseEstimationProcessor(BaseTaskProcessor):
     def valid_step(self, eval_model, batch, loss_factory, metric_factory):
         eval_model.eval()
         indices, images, keypoints = batch['indices'], batch['pixel_values'], batch['keypoints']
-        images = images.to(self.devices)
-        target = {'keypoints': keypoints.to(self.devices)}
+        images = images.to(self.devices, non_blocking=True, memory_format=self.memory_format)
+        target = {'keypoints': keypoints.to(self.devices, non_blocking=True)}
 
-        out = eval_model(images)
-        loss_factory.calc(out, target, phase='valid')
+        with torch.cuda.amp.autocast(enabled=self.mixed_precision):
+            out = eval_model(images)
+            loss_factory.calc(out, target, phase='valid')
 
         pred = self.postprocessor(out)
 
@@ -64,19 +64,18 @@ class PoseEstimationProcessor(BaseTaskProcessor):
             pred = pred[indices != -1]
             keypoints = keypoints[indices != -1]
 
-            gathered_pred = [None for _ in range(torch.distributed.get_world_size())]
-            gathered_labels = [None for _ in range(torch.distributed.get_world_size())]
+            gathered_pred = [None for _ in range(self.world_size)]
+            gathered_labels = [None for _ in range(self.world_size)]
 
-            torch.distributed.gather_object(pred, gathered_pred if torch.distributed.get_rank() == 0 else None, dst=0)
-            torch.distributed.gather_object(keypoints, gathered_labels if torch.distributed.get_rank() == 0 else None, dst=0)
-            torch.distributed.barrier()
-            if torch.distributed.get_rank() == 0:
+            torch.distributed.gather_object(pred, gathered_pred if self.rank == 0 else None, dst=0)
+            torch.distributed.gather_object(keypoints, gathered_labels if self.rank == 0 else None, dst=0)
+            if self.rank == 0:
                 pred = np.concatenate(gathered_pred, axis=0)
                 keypoints = np.concatenate(gathered_labels, axis=0)
 
         if self.single_gpu_or_rank_zero:
             logs = {
-                'images': images.detach().cpu().numpy(),
+                'images': images.detach(),
                 'target': keypoints,
                 'pred': pred
             }
@@ -85,7 +84,7 @@ class PoseEstimationProcessor(BaseTaskProcessor):
     def test_step(self, test_model, batch):
         test_model.eval()
         indices, images = batch['indices'], batch['pixel_values']
-        images = images.to(self.devices)
+        images = images.to(self.devices, non_blocking=True, memory_format=self.memory_format)
 
         out = test_model(images)
 
@@ -95,16 +94,15 @@ class PoseEstimationProcessor(BaseTaskProcessor):
         if self.conf.distributed:
             pred = pred[indices != -1]
 
-            gathered_pred = [None for _ in range(torch.distributed.get_world_size())]
+            gathered_pred = [None for _ in range(self.world_size)]
 
-            torch.distributed.gather_object(pred, gathered_pred if torch.distributed.get_rank() == 0 else None, dst=0)
-            torch.distributed.barrier()
-            if torch.distributed.get_rank() == 0:
+            torch.distributed.gather_object(pred, gathered_pred if self.rank == 0 else None, dst=0)
+            if self.rank == 0:
                 gathered_pred = sum(gathered_pred, [])
                 pred = gathered_pred
 
         if self.single_gpu_or_rank_zero:
-            results = {'images': images.detach().cpu().numpy(), 'pred': pred}
+            results = {'images': images.detach(), 'pred': pred}
             return results
 
     def get_metric_with_all_outputs(self, outputs, phase: Literal['train', 'valid'], metric_factory):
@@ -12,13 +12,13 @@ class SegmentationProcessor(BaseTaskProcessor):
     def train_step(self, train_model, batch, optimizer, loss_factory, metric_factory):
         train_model.train()
         batch['indices']
-        images = batch['pixel_values'].to(self.devices)
-        labels = batch['labels'].long().to(self.devices)
+        images = batch['pixel_values'].to(self.devices, non_blocking=True, memory_format=self.memory_format)
+        labels = batch['labels'].to(self.devices, non_blocking=True).long()
         target = {'target': labels}
 
         if 'edges' in batch:
             bd_gt = batch['edges']
-            target['bd_gt'] = bd_gt.to(self.devices)
+            target['bd_gt'] = bd_gt.to(self.devices, non_blocking=True)
 
         optimizer.zero_grad()
 
@@ -30,57 +30,41 @@ class SegmentationProcessor(BaseTaskProcessor):
         self.grad_scaler.step(optimizer)
         self.grad_scaler.update()
 
-        out = {k: v.detach() for k, v in out.items()}
-        pred = self.postprocessor(out)
+        with torch.no_grad():
+            pred = self.postprocessor(out)
 
         labels = labels.detach().cpu().numpy() # Change it to numpy before compute metric
-        if self.conf.distributed:
-            gathered_pred = [None for _ in range(torch.distributed.get_world_size())]
-            gathered_labels = [None for _ in range(torch.distributed.get_world_size())]
-
-            torch.distributed.gather_object(pred, gathered_pred if torch.distributed.get_rank() == 0 else None, dst=0)
-            torch.distributed.gather_object(labels, gathered_labels if torch.distributed.get_rank() == 0 else None, dst=0)
-            torch.distributed.barrier()
-            if torch.distributed.get_rank() == 0:
-                [metric_factory.update(g_pred, g_labels, phase='train') for g_pred, g_labels in zip(gathered_pred, gathered_labels)]
-        else:
-            metric_factory.update(pred, labels, phase='train')
+        # Each rank updates its own meters, they are summed over ranks in ``get_metric_with_all_outputs``
+        metric_factory.update(pred, labels, phase='train')
 
     def valid_step(self, eval_model, batch, loss_factory, metric_factory):
         eval_model.eval()
         indices = batch['indices']
-        images = batch['pixel_values'].to(self.devices)
-        labels = batch['labels'].long().to(self.devices)
+        images = batch['pixel_values'].to(self.devices, non_blocking=True, memory_format=self.memory_format)
+        labels = batch['labels'].to(self.devices, non_blocking=True).long()
         target = {'target': labels}
 
         if 'edges' in batch:
             bd_gt = batch['edges']
-            target['bd_gt'] = bd_gt.to(self.devices)
+            target['bd_gt'] = bd_gt.to(self.devices, non_blocking=True)
 
-        out = eval_model(images)
-        loss_factory.calc(out, target, phase='valid')
+        with torch.cuda.amp.autocast(enabled=self.mixed_precision):
+            out = eval_model(images)
+            loss_factory.calc(out, target, phase='valid')
 
         pred = self.postprocessor(out)
 
         indices = indices.numpy()
         labels = labels.detach().cpu().numpy() # Change it to numpy before compute metric
         if self.conf.distributed:
-            gathered_pred = [None for _ in range(torch.distributed.get_world_size())]
-            gathered_labels = [None for _ in range(torch.distributed.get_world_size())]
-
             # Remove dummy samples, they only come in distributed environment
             pred = pred[indices != -1]
             labels = labels[indices != -1]
-            torch.distributed.gather_object(pred, gathered_pred if torch.distributed.get_rank() == 0 else None, dst=0)
-            torch.distributed.gather_object(labels, gathered_labels if torch.distributed.get_rank() == 0 else None, dst=0)
-            torch.distributed.barrier()
-            if torch.distributed.get_rank() == 0:
-                [metric_factory.update(g_pred, g_labels, phase='valid') for g_pred, g_labels in zip(gathered_pred, gathered_labels)]
-        else:
-            metric_factory.update(pred, labels, phase='valid')
+        # Each rank updates its own meters, they are summed over ranks in ``get_metric_with_all_outputs``
+        metric_factory.update(pred, labels, phase='valid')
 
         logs = {
-            'images': images.detach().cpu().numpy(),
+            'images': images.detach(),
             'target': labels,
             'pred': pred
         }
@@ -94,7 +78,7 @@ class SegmentationProcessor(BaseTaskProcessor):
         test_model.eval()
         indices = batch['indices']
         images = batch['pixel_values']
-        images = images.to(self.devices)
+        images = images.to(self.devices, non_blocking=True, memory_format=self.memory_format)
 
         out = test_model(images)
 
@@ -102,22 +86,22 @@ class SegmentationProcessor(BaseTaskProcessor):
 
         indices = indices.numpy()
         if self.conf.distributed:
-            gathered_pred = [None for _ in range(torch.distributed.get_world_size())]
+            gathered_pred = [None for _ in range(self.world_size)]
 
             # Remove dummy samples, they only come in distributed environment
             pred = pred[indices != -1]
-            torch.distributed.gather_object(pred, gathered_pred if torch.distributed.get_rank() == 0 else None, dst=0)
-            torch.distributed.barrier()
-            if torch.distributed.get_rank() == 0:
+            torch.distributed.gather_object(pred, gathered_pred if self.rank == 0 else None, dst=0)
+            if self.rank == 0:
                 gathered_pred = sum(gathered_pred, [])
                 pred = gathered_pred
 
         if self.single_gpu_or_rank_zero:
             results = {
-                'images': images.detach().cpu().numpy(),
+                'images': images.detach(),
                 'pred': pred
             }
             return results
 
     def get_metric_with_all_outputs(self, outputs, phase: Literal['train', 'valid'], metric_factory):
-        pass
+        if self.conf.distributed:
+            metric_factory.all_reduce(phase, device=self.devices)
@@ -13,7 +13,6 @@ from omegaconf import DictConfig
 from torch.optim.lr_scheduler import _LRScheduler
 from torch.optim.optimizer import Optimizer
 from torch.utils.data import DataLoader
-from tqdm import tqdm
 
 from ..loggers.base import TrainingLogger
 from ..losses.builder import LossFactory
@@ -29,6 +28,12 @@ from .base import BasePipeline
 from .task_processors.base import BaseTaskProcessor
 
 NUM_SAMPLES = 16
+PROFILE_MODE_KWARGS = {
+    'shapes': {'record_shapes': True},
+    'memory': {'profile_memory': True},
+    'flops': {'with_flops': True},
+    'modules': {'with_modules': True},
+}
 
 
 class TrainingPipeline(BasePipeline):
@@ -53,6 +58,8 @@ class TrainingPipeline(BasePipeline):
         start_epoch: int,
         cur_epoch: c_int,
         profile: bool,
+        profile_mode: Literal['shapes', 'memory', 'flops', 'modules'] = 'shapes',
+        profile_with_stack: bool = False,
     ):
         super(TrainingPipeline, self).__init__(conf, task, task_processor, model_name, model, logger, timer)
         self.optimizer = optimizer
@@ -67,6 +74,14 @@ class TrainingPipeline(BasePipeline):
         self.start_epoch = start_epoch
         self.cur_epoch = cur_epoch
         self.profile = profile  # TODO: provide torch_tb_profiler for training
+        assert profile_mode in PROFILE_MODE_KWARGS, f"No such profile mode! (profile_mode: {profile_mode})"
+        self.profile_mode = profile_mode
+        self.profile_with_stack = profile_with_stack
+
+        # Plain values read every epoch, resolved once from the config
+        self.epochs = int(conf.training.epochs)
+        self.validation_epoch = int(conf.logging.validation_epoch)
+        self.save_checkpoint_epoch = int(conf.logging.save_checkpoint_epoch)
 
         self.training_history: Dict[int, Dict[
             Literal['train_losses', 'valid_losses', 'train_metrics', 'valid_metrics'], Dict[str, float]
@@ -80,18 +95,18 @@ class TrainingPipeline(BasePipeline):
         assert self.model is not None, "`self.model` is not defined!"
         assert self.optimizer is not None, "`self.optimizer` is not defined!"
         """Append here if you need more assertion checks!"""
-        assert self.conf.logging.save_checkpoint_epoch % self.conf.logging.validation_epoch == 0, \
+        assert self.save_checkpoint_epoch % self.validation_epoch == 0, \
             "`save_checkpoint_epoch` should be the multiplier of `validation_epoch`."
         return True
 
     def epoch_with_valid_logging(self, epoch: int):
-        validation_freq = self.conf.logging.validation_epoch
-        last_epoch = epoch == self.conf.training.epochs
+        validation_freq = self.validation_epoch
+        last_epoch = epoch == self.epochs
         return (epoch % validation_freq == 1 % validation_freq) or last_epoch
 
     def epoch_with_checkpoint_saving(self, epoch: int):
-        checkpoint_freq = self.conf.logging.save_checkpoint_epoch
-        last_epoch = epoch == self.conf.training.epochs
+        checkpoint_freq = self.save_checkpoint_epoch
+        last_epoch = epoch == self.epochs
         return (epoch % checkpoint_freq == 1 % checkpoint_freq) or last_epoch
 
     @property
@@ -100,15 +115,15 @@ class TrainingPipeline(BasePipeline):
 
     @property
     def train_loss(self):
-        return self.loss_factory.result('train').get('total').avg
+        return self.loss_factory.result('train').get('total')
 
     @property
     def valid_loss(self):
-        return self.loss_factory.result('valid').get('total').avg
+        return self.loss_factory.result('valid').get('total')
 
     def train(self):
         if self.single_gpu_or_rank_zero:
-            logger.debug(f"Training configuration:\n{yaml_for_logging(self.conf)}")
+            logger.opt(lazy=True).debug("Training configuration:\n{}", lambda: yaml_for_logging(self.conf))
             logger.info("-" * 40)
 
         self.timer.start_record(name='train_all')
@@ -116,7 +131,7 @@ class TrainingPipeline(BasePipeline):
 
         num_epoch = -1
         try:
-            for num_epoch in range(self.start_epoch, self.conf.training.epochs + 1):
+            for num_epoch in range(self.start_epoch, self.epochs + 1):
                 self.timer.start_record(name=f'train_epoch_{num_epoch}')
                 self.loss_factory.reset_values()
                 self.metric_factory.reset_values()
@@ -167,26 +182,31 @@ class TrainingPipeline(BasePipeline):
 
     def train_one_epoch(self, epoch):
         outputs = []
-        for _idx, batch in enumerate(tqdm(self.train_dataloader, leave=False)):
+        for _idx, batch in enumerate(self.wrap_progress_bar(self.train_dataloader)):
             out = self.task_processor.train_step(self.model, batch, self.optimizer, self.loss_factory, self.metric_factory)
             if self.model_ema:
-                self.model_ema.update(model=self.model.module if hasattr(self.model, 'module') else self.model)
+                self.model_ema.update(model=self.unwrapped_model)
             outputs.append(out)
         self.task_processor.get_metric_with_all_outputs(outputs, phase='train', metric_factory=self.metric_factory)
 
-    @torch.no_grad()
+    @torch.inference_mode()
     def validate(self, num_samples=NUM_SAMPLES):
         num_returning_samples = 0
         returning_samples = []
         outputs = []
         eval_model = self.model_ema.ema_model if self.model_ema else self.model
-        for _idx, batch in enumerate(tqdm(self.eval_dataloader, leave=False)):
+        for _idx, batch in enumerate(self.wrap_progress_bar(self.eval_dataloader)):
             out = self.task_processor.valid_step(eval_model, batch, self.loss_factory, self.metric_factory)
             if out is not None:
-                outputs.append(out)
                 if num_returning_samples < num_samples:
+                    # Images are kept on the device by ``valid_step``, copy them to host only for the returning samples
+                    out['images'] = out['images'].cpu().numpy()
                     returning_samples.append(out)
                     num_returning_samples += len(out['pred'])
+                else:
+                    # Images are only needed for the returning samples, don't keep them for the whole dataset
+                    out.pop('images', None)
+                outputs.append(out)
         self.task_processor.get_metric_with_all_outputs(outputs, phase='valid', metric_factory=self.metric_factory)
         return returning_samples
 
@@ -213,10 +233,7 @@ class TrainingPipeline(BasePipeline):
         self.training_history.update({epoch: summary_record})
 
     def save_checkpoint(self, epoch: int):
-        if self.model_ema:
-            model = self.model_ema.ema_model
-        else:
-            model = self.model.module if hasattr(self.model, 'module') else self.model
+        model = self.model_ema.ema_model if self.model_ema else self.unwrapped_model
         if self.save_dtype == torch.float16:
             model = copy.deepcopy(model).type(self.save_dtype)
         logging_dir = self.logger.result_dir
@@ -224,8 +241,7 @@ class TrainingPipeline(BasePipeline):
         optimizer_path = Path(logging_dir) / f"{self.task}_{self.model_name}_epoch_{epoch}_optimzer.pth"
 
         if self.save_optimizer_state:
-            optimizer = self.optimizer.module if hasattr(self.optimizer, 'module') else self.optimizer
-            save_dict = {'optimizer': optimizer.state_dict(), 'last_epoch': epoch}
+            save_dict = {'optimizer': self.optimizer.state_dict(), 'last_epoch': epoch}
             torch.save(save_dict, optimizer_path)
             logger.debug(f"Optimizer state saved at {str(optimizer_path)}")
 
@@ -248,8 +264,7 @@ class TrainingPipeline(BasePipeline):
         best_checkpoint_path = Path(logging_dir) / f"{self.task}_{self.model_name}_epoch_{best_epoch}.ext"
         best_model_save_path = Path(logging_dir) / f"{self.task}_{self.model_name}_best.ext"
 
-        model = self.model.module if hasattr(self.model, 'module') else self.model
-        best_model_to_save = copy.deepcopy(model)
+        best_model_to_save = copy.deepcopy(self.unwrapped_model)
 
         if self.is_graphmodule_training:
             best_model_to_save.load_state_dict(load_checkpoint(best_checkpoint_path.with_suffix('.pt')).state_dict())
@@ -276,7 +291,7 @@ class TrainingPipeline(BasePipeline):
 
     def save_summary(self, end_training=False):
         training_summary = TrainingSummary(
-            total_epoch=self.conf.training.epochs,
+            total_epoch=self.epochs,
             train_losses={epoch: record['train_losses'].get('total') for epoch, record in self.training_history.items()},
             valid_losses={epoch: record['valid_losses'].get('total') for epoch, record in self.training_history.items()
                           if 'valid_losses' in record},
@@ -314,13 +329,11 @@ class TrainingPipeline(BasePipeline):
                                              active=PROFILE_ACTIVE,
                                              repeat=PROFILE_REPEAT),
             on_trace_ready=torch.profiler.tensorboard_trace_handler('./log/test'),
-            record_shapes=True,
-            profile_memory=True,
-            with_flops=True,
-            with_modules=True
+            with_stack=self.profile_with_stack,
+            **PROFILE_MODE_KWARGS[self.profile_mode]
         ) as prof:
             for idx, batch in enumerate(self.train_dataloader):
                 if idx >= (PROFILE_WAIT + PROFILE_WARMUP + PROFILE_ACTIVE) * PROFILE_REPEAT:
                     break
-                self.task_processor.train_step(batch)
+                self.task_processor.train_step(self.model, batch, self.optimizer, self.loss_factory, self.metric_factory)
                 prof.step()
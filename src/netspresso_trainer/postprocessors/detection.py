@@ -1,5 +1,6 @@
 from functools import partial
 
+import numpy as np
 import torch
 import torch.nn.functional as F
 import torchvision
@@ -119,31 +120,33 @@ def anchor_free_decoupled_head_decode(pred, original_shape, score_thresh=0.7):
 
 
 def nms(prediction, nms_thresh=0.45, class_agnostic=False):
-    output = [torch.zeros(0, 7).to(prediction[0].device) for i in range(len(prediction))]
-    for i, image_pred in enumerate(prediction):
-
-        # If none are remaining => process next image
-        if not image_pred.size(0):
-            continue
-
-        if class_agnostic:
-            nms_out_index = torchvision.ops.nms(
-                image_pred[:, :4],
-                image_pred[:, 4] * image_pred[:, 5],
-                nms_thresh,
-            )
-        else:
-            nms_out_index = torchvision.ops.batched_nms(
-                image_pred[:, :4],
-                image_pred[:, 4] * image_pred[:, 5],
-                image_pred[:, 6],
-                nms_thresh,
-            )
-
-        image_pred = image_pred[nms_out_index]
-        output[i] = torch.cat((output[i], image_pred))
-
-    return output
+    num_images = len(prediction)
+    image_idxs = torch.cat([torch.full((len(image_pred),), i, dtype=torch.int64, device=image_pred.device)
+                            for i, image_pred in enumerate(prediction)])
+    prediction = torch.cat(prediction)
+
+    # If none are remaining => nothing to suppress
+    if not prediction.size(0):
+        return [prediction.new_zeros((0, 7)) for _ in range(num_images)]
+
+    # Run a single NMS for the whole batch: shift boxes of each image (and class) apart so they never overlap,
+    # like the coordinate trick of ``torchvision.ops.batched_nms``. Offsets grow with batch size, so use float64.
+    # Decoded boxes may cross the image border, so move them to non-negative coordinates first.
+    boxes = prediction[:, :4].double()
+    boxes = boxes - boxes.min()
+    if class_agnostic:
+        group_idxs = image_idxs.double()
+    else:
+        labels = prediction[:, 6].double()
+        group_idxs = image_idxs.double() * (labels.max() + 1) + labels
+    offsets = group_idxs * (boxes.max() + 1)
+    keep = torchvision.ops.nms(boxes + offsets[:, None], (prediction[:, 4] * prediction[:, 5]).double(), nms_thresh)
+
+    # Regroup kept boxes per image, stable sort keeps them in descending score order within each image
+    keep_image_idxs, order = torch.sort(image_idxs[keep], stable=True)
+    keep = keep[order]
+    num_keep_per_image = torch.bincount(keep_image_idxs, minlength=num_images).tolist()
+    return list(prediction[keep].split(num_keep_per_image))
 
 
 class DetectionPostprocessor:
@@ -168,7 +171,10 @@ class DetectionPostprocessor:
         if self.postprocess:
             pred = self.postprocess(pred)
 
-        pred = [(torch.cat([p[:, :4], p[:, 4:5] * p[:, 5:6]], dim=-1).detach().cpu().numpy(),
-                      p[:, 6].to(torch.int).detach().cpu().numpy())
-                      for p in pred]
+        # Copy detections of all images to host at once, then split them per image
+        split_indices = np.cumsum([len(p) for p in pred])[:-1]
+        pred = torch.cat(pred)
+        boxes_and_scores = torch.cat([pred[:, :4], pred[:, 4:5] * pred[:, 5:6]], dim=-1).detach().cpu().numpy()
+        labels = pred[:, 6].to(torch.int).detach().cpu().numpy()
+        pred = list(zip(np.split(boxes_and_scores, split_indices), np.split(labels, split_indices)))
         return pred
@@ -21,7 +21,9 @@ def train_common(
     logging_dir: Path,
     log_level: Literal['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'] = 'INFO'
 ):
-    distributed, world_size, rank, devices = set_device(conf.environment.seed)
+    #TODO: Temporarily set ``cudnn_benchmark`` as optional since this is experimental
+    cudnn_benchmark = conf.environment.cudnn_benchmark if hasattr(conf.environment, 'cudnn_benchmark') else False
+    distributed, world_size, rank, devices = set_device(conf.environment.seed, cudnn_benchmark=cudnn_benchmark)
     logger = set_logger(level=log_level, distributed=distributed)
 
     conf.distributed = distributed
@@ -66,6 +68,10 @@ def train_common(
         )
 
     model = model.to(device=devices)
+    #TODO: Temporarily set ``channels_last`` as optional since this is experimental
+    channels_last = conf.training.channels_last if hasattr(conf.training, 'channels_last') else False
+    if channels_last:
+        model = model.to(memory_format=torch.channels_last)
     if conf.distributed:
         model = DDP(model, device_ids=[devices], find_unused_parameters=True)  # TODO: find_unused_parameters should be false (for now, PIDNet has problem)
 
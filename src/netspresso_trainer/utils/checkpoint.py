@@ -35,6 +35,8 @@ def save_checkpoint(obj_dict, f: Union[str, Path]) -> None:
     file_path, extension = _validate_file(f)
 
     if extension == '.safetensors':
+        # safetensors only accepts contiguous tensors, e.g. conv weights of a channels_last model are not
+        obj_dict = {k: v.contiguous() for k, v in obj_dict.items()}
         save_file(obj_dict, str(file_path))
         return
 
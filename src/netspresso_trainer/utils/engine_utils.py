@@ -167,7 +167,9 @@ def get_new_logging_dir(output_root_dir, project_id, mode: Literal['training', '
     version_idx = 0
     project_dir: Path = Path(output_root_dir) / project_id
 
-    while (project_dir / f"version_{version_idx}").exists():
+    # List the project directory once instead of probing each version path
+    existing_names = set(os.listdir(project_dir)) if project_dir.is_dir() else set()
+    while f"version_{version_idx}" in existing_names:
         version_idx += 1
 
     new_logging_dir: Path = project_dir / f"version_{version_idx}"
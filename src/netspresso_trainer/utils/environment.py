@@ -12,9 +12,13 @@ import torch.nn as nn
 __all__ = ['set_device', 'get_device']
 
 
-def set_device(seed):
+def set_device(seed, cudnn_benchmark=False):
     # Torch settings
-    cudnn.enabled = False
+    # cuDNN is kept off by default for reproducibility, ``cudnn_benchmark`` trades it for autotuned conv kernels
+    cudnn.enabled = cudnn_benchmark
+    cudnn.benchmark = cudnn_benchmark
+    cudnn.allow_tf32 = cudnn_benchmark
+    torch.backends.cuda.matmul.allow_tf32 = cudnn_benchmark
 
     # Reproducibility (except cudnn deterministicity)
     if seed is not None:
@@ -31,7 +35,7 @@ def set_device(seed):
     world_size = 1
     rank = 0  # global rank
     if distributed:
-        assert seed is not None and cudnn.benchmark is False, "distributed training requires reproducibility"
+        assert seed is not None, "distributed training requires reproducibility"
         dist.init_process_group(backend='nccl', init_method='env://')
         rank = dist.get_rank()
         devices = torch.device(f'cuda:{rank}')
@@ -1,6 +1,8 @@
 # import logging
 import sys
 import time
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 from typing import Literal, Optional, Union
 
@@ -27,9 +29,13 @@ def rank_filter(record):
     except RuntimeError:  # Default process group has not been initialized, please make sure to call init_process_group.
         return True
 
+LOG_FORMAT = "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+
+@lru_cache(maxsize=None)
 def get_format(level: str, distributed: bool = False):
-    debug_and_multi_gpu = (level == 'DEBUG' and distributed)
-    fmt = "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+    # Rank is fixed for the process, so the format is built once per (level, distributed) and reused by every handler
+    debug_and_multi_gpu = (level == 'DEBUG' and distributed and dist.is_initialized())
+    fmt = LOG_FORMAT
 
     if debug_and_multi_gpu:
         fmt = f"[GPU:{dist.get_rank()}] " + fmt
@@ -39,14 +45,20 @@ def get_format(level: str, distributed: bool = False):
 
 def add_stream_handler(level: str, distributed: bool):
     fmt, only_rank_zero = get_format(level, distributed=distributed)
-    logger.add(sys.stderr, level=level, format=fmt, filter=rank_filter if only_rank_zero else "")
+    # Rank is fixed for the process, so skip the handler on other ranks instead of filtering every record
+    if only_rank_zero and not rank_filter(None):
+        return
+    logger.add(sys.stderr, level=level, format=fmt)
 
 
 
 def add_file_handler(log_filepath: str, distributed: bool):
+    # Ranks skipped by ``add_stream_handler`` have no handler (and no minimum level), so they skip the file too
+    if logger._core.min_level not in LEVELNO_TO_LEVEL_NAME:
+        return
     level = LEVELNO_TO_LEVEL_NAME[logger._core.min_level]
-    fmt, only_rank_zero = get_format(level, distributed=distributed)
-    logger.add(log_filepath, level=level, format=fmt, filter=rank_filter if only_rank_zero else "", enqueue=True)
+    fmt, _ = get_format(level, distributed=distributed)
+    logger.add(log_filepath, level=level, format=fmt, enqueue=True)
 
 
 
@@ -70,23 +82,23 @@ def set_logger(level: str = 'INFO', distributed=False):
     return logger
 
 
-def _yaml_for_logging(config: DictConfig) -> DictConfig:
+def _yaml_for_logging(config: DictConfig) -> dict:
     # TODO: better configuration logging
     list_maximum_index = 2
-    new_config = OmegaConf.create()
+    new_config = {}
     for k, v in config.items():
         if isinstance(v, DictConfig):
-            new_config.update({k: _yaml_for_logging(v)})
+            new_config[k] = _yaml_for_logging(v)
         elif isinstance(v, ListConfig):
-            new_config.update({k: list(map(str, v[:list_maximum_index])) + ['...']})
+            new_config[k] = [str(x) for x in islice(v, list_maximum_index)] + ['...']
         else:
-            new_config.update({k: v})
+            new_config[k] = v
     return new_config
 
 
 def yaml_for_logging(config: DictConfig):
-    config_summarized = OmegaConf.create(_yaml_for_logging(config))
-    return OmegaConf.to_yaml(config_summarized)
+    # Summarize into plain containers so that OmegaConf copies the tree only once, in ``to_yaml``
+    return OmegaConf.to_yaml(_yaml_for_logging(config))
 
 
 if __name__ == '__main__':
@@ -62,6 +62,14 @@ class MetricMeter(object):
     def avg(self) -> float:
         return self._avg
 
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    @property
+    def count(self) -> int:
+        return self._count
+
 
 class TimeRecode:
     def __init__(self) -> None:
@@ -0,0 +1,27 @@
+import tempfile
+from pathlib import Path
+
+import torch
+import torch.nn as nn
+from netspresso_trainer.utils.checkpoint import load_checkpoint, save_checkpoint
+
+if __name__ == "__main__":
+
+    model = nn.Sequential(nn.Conv2d(3, 8, 3), nn.BatchNorm2d(8), nn.Conv2d(8, 4, 1))
+    model = model.to(memory_format=torch.channels_last)
+    assert not model[0].weight.is_contiguous()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # OK: channels_last model is saved as safetensors
+        checkpoint_path = Path(tmp_dir) / "model.safetensors"
+        save_checkpoint(model.state_dict(), checkpoint_path)
+
+        # OK: loaded weights are identical to the saved ones
+        state_dict = load_checkpoint(checkpoint_path)
+        assert state_dict.keys() == model.state_dict().keys()
+        for k, v in model.state_dict().items():
+            assert torch.equal(state_dict[k], v), k
+
+        # OK: weights can be loaded back to a fresh model
+        new_model = nn.Sequential(nn.Conv2d(3, 8, 3), nn.BatchNorm2d(8), nn.Conv2d(8, 4, 1))
+        new_model.load_state_dict(state_dict)
@@ -0,0 +1,63 @@
+import torch
+import torchvision
+from netspresso_trainer.postprocessors.detection import nms
+
+
+def per_image_nms(prediction, nms_thresh=0.45, class_agnostic=False):
+    output = []
+    for image_pred in prediction:
+        if class_agnostic:
+            index = torchvision.ops.nms(image_pred[:, :4], image_pred[:, 4] * image_pred[:, 5], nms_thresh)
+        else:
+            index = torchvision.ops.batched_nms(image_pred[:, :4], image_pred[:, 4] * image_pred[:, 5], image_pred[:, 6], nms_thresh)
+        output.append(image_pred[index])
+    return output
+
+
+def make_prediction(boxes, scores, labels):
+    boxes = torch.tensor(boxes, dtype=torch.float32)
+    scores = torch.tensor(scores, dtype=torch.float32)[:, None]
+    labels = torch.tensor(labels, dtype=torch.float32)[:, None]
+    return torch.cat([boxes, scores, torch.ones_like(scores), labels], dim=-1)
+
+
+if __name__ == "__main__":
+
+    # OK: boxes crossing the image border in different images or classes don't suppress each other
+    # Without moving to non-negative coordinates, the offset puts the negative box exactly onto the other one.
+    across_images = [
+        make_prediction([[0., 0., 10., 10.]], [0.9], [0]),
+        make_prediction([[-11., -11., -1., -1.]], [0.8], [0]),
+    ]
+    across_classes = [
+        make_prediction([[0., 0., 10., 10.], [-11., -11., -1., -1.]], [0.9, 0.8], [0, 1]),
+    ]
+    for prediction, class_agnostic, num_keep in [
+        (across_images, False, [1, 1]),
+        (across_images, True, [1, 1]),
+        (across_classes, False, [2]),
+    ]:
+        out = nms(prediction, class_agnostic=class_agnostic)
+        expected = per_image_nms(prediction, class_agnostic=class_agnostic)
+        assert [len(o) for o in out] == [len(e) for e in expected] == num_keep
+        for o, e in zip(out, expected):
+            assert torch.equal(o, e)
+
+    # OK: same result as per-image NMS on random boxes, including empty images
+    generator = torch.Generator().manual_seed(0)
+    prediction = []
+    for num_boxes in [50, 0, 300, 7]:
+        xy = torch.rand((num_boxes, 2), generator=generator) * 500 - 100
+        wh = torch.rand((num_boxes, 2), generator=generator) * 100
+        scores = torch.rand((num_boxes, 2), generator=generator)
+        labels = torch.randint(0, 5, (num_boxes, 1), generator=generator).float()
+        prediction.append(torch.cat([xy, xy + wh, scores, labels], dim=-1))
+    for class_agnostic in [False, True]:
+        out = nms(prediction, class_agnostic=class_agnostic)
+        expected = per_image_nms(prediction, class_agnostic=class_agnostic)
+        for o, e in zip(out, expected):
+            assert torch.equal(o, e)
+
+    # OK: batch without any boxes
+    out = nms([torch.zeros((0, 7)), torch.zeros((0, 7))])
+    assert [o.shape for o in out] == [torch.Size([0, 7]), torch.Size([0, 7])]
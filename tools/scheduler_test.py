@@ -3,7 +3,6 @@
 import argparse
 import os
 
-import numpy as np
 import torch
 import torch.nn as nn
 from netspresso_trainer.optimizers import build_optimizer
@@ -31,12 +30,16 @@ def parse_args():
 class SampleDataset:
     def __init__(self, samples=100) -> None:
         self.samples = samples
+        # Values don't matter for scheduler test, so generate them all at once
+        generator = torch.Generator().manual_seed(0)
+        self.x = torch.rand(samples, IN_FEATURES, generator=generator)
+        self.y = torch.rand(samples, OUT_FEATURES, generator=generator)
 
     def __len__(self):
         return self.samples
 
     def __getitem__(self, idx):
-        return torch.FloatTensor(np.random.rand(IN_FEATURES)), torch.FloatTensor(np.random.rand(OUT_FEATURES))
+        return self.x[idx], self.y[idx]
 
 
 if __name__ == '__main__':
@@ -53,7 +56,7 @@ if __name__ == '__main__':
                                 wd=conf_training.weight_decay,
                                 momentum=conf_training.momentum)
 
-    dataloader = torch.utils.data.DataLoader(SampleDataset(samples=25), batch_size=5)
+    dataloader = torch.utils.data.DataLoader(SampleDataset(samples=25), batch_size=5, pin_memory=True)
     scheduler, _ = build_scheduler(optimizer, conf_training)
 
     loss_func = nn.MSELoss()
@@ -61,8 +64,8 @@ if __name__ == '__main__':
     steps = 0
     for epoch in range(conf_training.epochs):
         for x, y in dataloader:
-            x = x.cuda()
-            y = y.cuda()
+            x = x.cuda(non_blocking=True)
+            y = y.cuda(non_blocking=True)
 
             optimizer.zero_grad()
             out = model(x)
@@ -70,6 +73,6 @@ if __name__ == '__main__':
             loss.backward()
 
             optimizer.step()
-            scheduler.step(epoch)
             steps += 1
+        scheduler.step(epoch)  # schedulers in this repo are stepped per epoch, as in the training pipeline
         print(f"{steps} | {epoch}: ", [param['lr'] for param in optimizer.param_groups])